@@ -13,26 +13,64 @@
 # limitations under the License.
 
 # Imports
+import argparse
+import atexit
 import pyxel
-from core.common import WINDOW_HEIGHT, WINDOW_WIDTH
+from random import randrange
+from typing import Optional
+
+from core import backend
+from core.common import WINDOW_HEIGHT, WINDOW_WIDTH, FPS, Clock, FrameClock
+from core.replay import InputRecording, InputRecorder, InputReplayer
+from core.tracer import EventTracer
+from game import events
 from game.game import Game
 from res.resources_load import startup_load_resources
 
 # Main App Class
 class App:
-    def __init__(self):
+    def __init__(self, record_path: Optional[str] = None, replay_path: Optional[str] = None, profile: bool = False, trace_path: Optional[str] = None):
         """
         Initialize game.
+        `record_path` records the session's input to a file, `replay_path` plays a recorded session back,
+        `profile` starts the game with the frame profiler enabled and `trace_path` traces the events, writing the trace to a file (also periodically, and when quitting).
         """
-        # Pyxel stuff
-        pyxel.init(WINDOW_WIDTH, WINDOW_HEIGHT, capture_scale=8, title="Misi Hijau", fps=30, quit_key=pyxel.KEY_NONE)
+        # Pyxel stuff (or whatever backend is active)
+        backend.get().init(WINDOW_WIDTH, WINDOW_HEIGHT, title="Misi Hijau", fps=FPS)
         startup_load_resources()
+
+        # A recorded session can only be reproduced with the same random numbers and a frame-based timer
+        recorder: Optional[InputRecorder] = None
+        replayer: Optional[InputReplayer] = None
+        clock: Optional[Clock] = None
+        if replay_path:
+            recording = InputRecording.load(replay_path)
+            replayer = InputReplayer(recording)
+            pyxel.rseed(recording.seed)
+            clock = FrameClock()
+        elif record_path:
+            recorder = InputRecorder(randrange(2 ** 32), record_path)
+            atexit.register(recorder.save)
+            pyxel.rseed(recorder.recording.seed)
+            clock = FrameClock()
         
-        self.game = Game()
+        self.game = Game(clock)
+        event_handler = self.game.game_handler.game_components.event_handler
+        self.game.game_handler.game_components.keylistener.start_recording(recorder) if recorder else None
+        self.game.game_handler.game_components.keylistener.start_replay(replayer) if replayer else None
+        self.game.profiler.enable() if profile else None
+        tracer = EventTracer(save_path=trace_path) if trace_path else None
+        if tracer:
+            event_handler.start_tracing(tracer)
+            atexit.register(tracer.save)
+
+        # Quitting the backend might end the process without running the `atexit` functions, so save before quitting too
+        event_handler.add_handler(events.QuitGame.name, recorder.save) if recorder else None
+        event_handler.add_handler(events.QuitGame.name, tracer.save) if tracer else None
 
         # Run Pyxel!
         print("Selamat datang di Misi Hijau!")
-        pyxel.run(self.update, self.draw)
+        backend.get().run(self.update, self.draw)
 
     def update(self):
         """
@@ -47,6 +85,12 @@ class App:
         self.game.draw()
 
 if __name__ == "__main__":
-    App()
+    parser = argparse.ArgumentParser(description="Misi Hijau")
+    parser.add_argument("--record", metavar="FILE", help="record the keys pressed during this session to a file")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recorded session")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler enabled")
+    parser.add_argument("--trace", metavar="FILE", help="trace the events and write the trace to a file (in the Chrome trace format)")
+    args = parser.parse_args()
+    App(args.record, args.replay, args.profile, args.trace)
 
 print("Terima kasih telah bermain!")
\ No newline at end of file
@@ -0,0 +1,146 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark runner. Runs the game without a window through scripted scenarios and reports the timings as JSON.
+
+Usage: `python misi_hijau/benchmark.py [--ticks N] [--seed N] [--scenario NAME ...] [--output FILE]`
+
+The game is run with `HeadlessBackend` and a `FrameClock`, and the random seed is fixed, so every run of a scenario
+simulates exactly the same frames; only the timings differ between builds (or machines).
+"""
+
+# Imports
+import argparse
+import json
+import platform
+import pyxel
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Optional
+
+from core import backend
+from core.common import FrameClock, FPS, WINDOW_WIDTH, WINDOW_HEIGHT
+from game import events
+from game.game import Game
+from game.sprites.enemy import EnemySquidge
+from res.resources_load import startup_load_resources
+
+DEFAULT_TICKS = 1800 # a minute of gameplay
+DEFAULT_SEED = 1
+WARMUP_TICKS = 30 # ticks run before measuring
+
+@dataclass
+class Scenario:
+    """
+    A benchmark scenario.
+    """
+    name: str
+    description: str
+    level_idx: int = 1
+    keys_held: list[int] = field(default_factory=list[int])
+    on_tick: Optional[Callable[[Game, int], None]] = None # called before every tick with the game and the tick number
+
+def _all_squidges_shoot(game: Game, tick: int):
+    game_components = game.game_handler.game_components
+    player = game_components.game_sprites.sprites_handler[1].player
+    for sprite_handler in game_components.game_sprites.sprites_handler:
+        for enemy in getattr(sprite_handler, "enemies", []):
+            if isinstance(enemy, EnemySquidge):
+                game_components.event_handler.trigger_event(events.SquidgeShootBullet(enemy.coord.x_map, enemy.coord.y_map, player.coord.x_map, player.coord.y_map))
+
+def _bullet_spray(game: Game, tick: int):
+    game_components = game.game_handler.game_components
+    player = game_components.game_sprites.sprites_handler[1].player
+    for x in range(0, WINDOW_WIDTH, 32):
+        game_components.event_handler.trigger_event(events.PlayerShootBullets(x, player.coord.y_map))
+
+def _restart_cycle(game: Game, tick: int):
+    if tick % 30 == 0:
+        game.game_handler.game_components.event_handler.trigger_event(events.LevelRestart)
+        game.game_handler.game_components.event_handler.trigger_event(events.ActivateLevel)
+
+SCENARIOS = [
+    Scenario("level1_idle", "Level 1 without any input."),
+    Scenario("level3_squidges_firing", "Level 3 with every squidge firing at the player on every tick.", 3, [pyxel.KEY_UP], _all_squidges_shoot),
+    Scenario("bullet_spray", "Level 1 with a row of player bullets shot across the screen on every tick, from the bottom of the level.", 1, [], _bullet_spray),
+    Scenario("restart_cycles", "Level 2, restarted every second while shooting.", 2, [pyxel.KEY_SPACE, pyxel.KEY_UP], _restart_cycle),
+]
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+def run_scenario(scenario: Scenario, ticks: int, seed: int) -> dict[str, float | int | dict[str, float]]:
+    """
+    Run a scenario on a freshly built game and return its results.
+    """
+    headless_backend = backend.HeadlessBackend()
+    backend.set_backend(headless_backend)
+    headless_backend.init(WINDOW_WIDTH, WINDOW_HEIGHT, title="Misi Hijau", fps=FPS)
+    startup_load_resources() # also reloads the tilemap, since levels modify it
+    pyxel.rseed(seed)
+
+    game = Game(FrameClock())
+    game.game_handler.levelhandler.set_lvl_by_idx(scenario.level_idx)
+    game.game_handler.game_components.event_handler.trigger_event(events.StartGame)
+    game.game_handler.game_components.event_handler.trigger_event(events.ActivateLevel)
+    headless_backend.set_keys_held(scenario.keys_held)
+
+    frame_times: list[float] = []
+    for tick in range(WARMUP_TICKS + ticks):
+        start = perf_counter()
+        scenario.on_tick(game, tick) if scenario.on_tick else None
+        headless_backend.step(game.update, game.draw)
+        frame_times.append(perf_counter() - start) if tick >= WARMUP_TICKS else None
+
+    sorted_frame_times = sorted(frame_times)
+    return {
+        "ticks": ticks,
+        "ticks_per_sec": ticks / sum(frame_times),
+        "frame_ms": {
+            "mean": sum(frame_times) / len(frame_times) * 1000,
+            "p50": _percentile(sorted_frame_times, 50) * 1000,
+            "p95": _percentile(sorted_frame_times, 95) * 1000,
+            "p99": _percentile(sorted_frame_times, 99) * 1000,
+            "max": sorted_frame_times[-1] * 1000
+        }
+    }
+
+def main():
+    scenarios_by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    parser = argparse.ArgumentParser(description="Run the Misi Hijau benchmark scenarios.")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="amount of ticks to measure per scenario")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    parser.add_argument("--scenario", action="append", choices=list(scenarios_by_name), help="scenario to run (can be repeated; runs every scenario by default)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of printing it")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "scenarios": {
+            name: run_scenario(scenarios_by_name[name], args.ticks, args.seed) for name in (args.scenario if args.scenario else scenarios_by_name)
+        }
+    }
+
+    report_json = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(report_json + "\n")
+    else:
+        print(report_json)
+
+if __name__ == "__main__":
+    main()
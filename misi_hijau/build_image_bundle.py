@@ -0,0 +1,61 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Builds the image bundle: every PNG under `res/img` converted to palette color indices (the same way Pyxel does it when loading
+the PNG) and packed into `res/img_bundle.bin`, which the game then loads images from without decoding anything.
+
+Usage: `python misi_hijau/build_image_bundle.py [--output FILE]`
+
+Run it again whenever an image changes. Without the bundle, the game just decodes the PNGs.
+"""
+
+# Imports
+import argparse
+import os
+import pyxel
+
+from res.resources_load import IMG_PATH, IMAGE_BUNDLE_PATH, ImageBundle, write_image_bundle
+
+FRAME_WIDTH = 256
+FRAME_HEIGHT = 256
+
+def convert_image(path: str) -> bytes:
+    """
+    Decode a PNG into a frame of palette color indices. Smaller images are padded with black; bigger ones are cropped.
+    """
+    image = pyxel.Image.from_image(path)
+    frame = bytearray(FRAME_WIDTH * FRAME_HEIGHT)
+    for y in range(min(image.height, FRAME_HEIGHT)):
+        for x in range(min(image.width, FRAME_WIDTH)):
+            frame[y * FRAME_WIDTH + x] = image.pget(x, y)
+    return bytes(frame)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the Misi Hijau images into an image bundle.")
+    parser.add_argument("--output", default=IMAGE_BUNDLE_PATH, help="where to write the bundle")
+    args = parser.parse_args()
+
+    frames: dict[str, bytes] = {}
+    for directory, _, file_names in sorted(os.walk(IMG_PATH)):
+        for file_name in sorted(file_names):
+            if file_name.lower().endswith(".png"):
+                path = os.path.join(directory, file_name)
+                frames[ImageBundle.get_frame_name(path)] = convert_image(path)
+
+    write_image_bundle(args.output, FRAME_WIDTH, FRAME_HEIGHT, frames)
+    print(f"Packed {len(frames)} images into {args.output}")
+
+if __name__ == "__main__":
+    main()
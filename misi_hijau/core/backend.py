@@ -0,0 +1,477 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Backends that do the actual drawing, sound playing and input polling.
+
+Components and sprites should go through the active backend (`backend.get()`) instead of calling Pyxel directly,
+so the game can also run without a window (for example on a CI machine) with `HeadlessBackend`.
+"""
+
+import ctypes
+import pyxel
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+
+TILEMAP_SIZE = 256 # in tiles
+
+def is_key_repeated(held_frames: int, hold: Optional[int] = None, repeat: Optional[int] = None) -> bool:
+    """
+    Whether `btnp` should return `True` for a key that has been held down for `held_frames` frames.
+    Used by anything that emulates Pyxel's input from a set of held keys.
+    """
+    if held_frames == 0:
+        return True
+    if repeat:
+        held_frames -= hold if hold else 0
+        return held_frames > 0 and held_frames % repeat == 0
+    return False
+
+class Backend(ABC):
+    """
+    A game backend.
+    """
+
+    @property
+    @abstractmethod
+    def frame_count(self) -> int:
+        """
+        Amount of frames that have passed since the game started.
+        """
+
+    # Lifecycle
+    @abstractmethod
+    def init(self, width: int, height: int, title: str, fps: int):
+        """
+        Initialize the backend (e.g. open the game window).
+        """
+
+    @abstractmethod
+    def load_resources(self, path: str, image: bool = True, tilemap: bool = True, sound: bool = True, music: bool = True):
+        """
+        Load a Pyxel resource file (`.pyxres`), or only some parts of it.
+        """
+
+    @abstractmethod
+    def run(self, update: Callable[[], None], draw: Callable[[], None]):
+        """
+        Run the game loop.
+        """
+
+    @abstractmethod
+    def quit(self):
+        """
+        Quit the game loop.
+        """
+
+    # Input
+    @abstractmethod
+    def btn(self, key: int) -> bool:
+        """
+        Returns `True` if `key` is being held down.
+        """
+
+    @abstractmethod
+    def btnp(self, key: int, hold: Optional[int] = None, repeat: Optional[int] = None) -> bool:
+        """
+        Returns `True` if `key` is pressed on this frame (or repeated, when `hold` and `repeat` are set).
+        """
+
+    # Audio
+    @abstractmethod
+    def play(self, channel: int, idx: int, loop: bool = False):
+        pass
+
+    @abstractmethod
+    def playm(self, idx: int, loop: bool = False):
+        pass
+
+    @abstractmethod
+    def play_pos(self, channel: int) -> Optional[tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def stop(self, channel: int):
+        pass
+
+    # Graphics
+    @abstractmethod
+    def set_draw_target(self, image: Optional[Any]):
+        """
+        Make the drawing calls (`cls`, `pset`, `rect`, `rectb`, `text`, `blt`, `bltm`) draw on an offscreen image instead of the screen.
+        Pass `None` to draw on the screen again.
+        """
+
+    @abstractmethod
+    def camera(self):
+        pass
+
+    @abstractmethod
+    def cls(self, col: int):
+        pass
+
+    @abstractmethod
+    def pset(self, x: float, y: float, col: int):
+        pass
+
+    @abstractmethod
+    def rect(self, x: float, y: float, w: float, h: float, col: int):
+        pass
+
+    @abstractmethod
+    def rectb(self, x: float, y: float, w: float, h: float, col: int):
+        pass
+
+    @abstractmethod
+    def text(self, x: float, y: float, s: str, col: int):
+        pass
+
+    @abstractmethod
+    def blt(self, x: float, y: float, img: int | Any, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        """
+        Draw a part of an image bank (or an offscreen image from `create_image`/`decode_image`) to the screen.
+        """
+
+    @abstractmethod
+    def bltm(self, x: float, y: float, tm: int, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        pass
+
+    @abstractmethod
+    def load_image(self, img: int, x: int, y: int, path: str):
+        """
+        Decode an image file into an image bank.
+        """
+
+    @abstractmethod
+    def decode_image(self, path: str) -> Any:
+        """
+        Decode an image file into an offscreen image, which can later be copied to an image bank with `copy_image`.
+        """
+
+    @abstractmethod
+    def copy_image(self, img: int, x: int, y: int, image: Any):
+        """
+        Copy a whole offscreen image (from `decode_image`) to an image bank.
+        """
+
+    @abstractmethod
+    def copy_image_data(self, img: int, x: int, y: int, width: int, height: int, data: bytes | memoryview):
+        """
+        Copy raw pixels (one palette color index per byte, row by row) to an image bank.
+        """
+
+    @abstractmethod
+    def create_image(self, width: int, height: int) -> Any:
+        """
+        Create a blank (all black) offscreen image, which can be drawn on and then drawn to the screen with `blt`.
+        """
+
+    @abstractmethod
+    def image_pset(self, image: Any, x: int, y: int, col: int):
+        """
+        Draw a pixel on an offscreen image.
+        """
+
+    # Tilemap
+    @abstractmethod
+    def tilemap_pget(self, tm: int, x: int, y: int) -> tuple[int, int]:
+        """
+        Get the tile (U, V) at tile coordinate `x`, `y` of tilemap `tm`.
+        """
+
+    @abstractmethod
+    def tilemap_pset(self, tm: int, x: int, y: int, uv: tuple[int, int]):
+        """
+        Set the tile (U, V) at tile coordinate `x`, `y` of tilemap `tm`.
+        """
+
+class PyxelBackend(Backend):
+    """
+    The default backend, which is just Pyxel.
+    """
+
+    def __init__(self):
+        self._canvas: Any = pyxel # either the Pyxel module itself (the screen) or an image; both have the same drawing methods
+
+    @property
+    def frame_count(self) -> int:
+        return pyxel.frame_count
+
+    def init(self, width: int, height: int, title: str, fps: int):
+        pyxel.init(width, height, capture_scale=8, title=title, fps=fps, quit_key=pyxel.KEY_NONE)
+
+    def load_resources(self, path: str, image: bool = True, tilemap: bool = True, sound: bool = True, music: bool = True):
+        pyxel.load(path, image=image, tilemap=tilemap, sound=sound, music=music)
+
+    def run(self, update: Callable[[], None], draw: Callable[[], None]):
+        pyxel.run(update, draw)
+
+    def quit(self):
+        pyxel.quit()
+
+    def btn(self, key: int) -> bool:
+        return pyxel.btn(key)
+
+    def btnp(self, key: int, hold: Optional[int] = None, repeat: Optional[int] = None) -> bool:
+        return pyxel.btnp(key, hold=hold, repeat=repeat)
+
+    def play(self, channel: int, idx: int, loop: bool = False):
+        pyxel.play(channel, idx, loop=loop)
+
+    def playm(self, idx: int, loop: bool = False):
+        pyxel.playm(idx, loop=loop)
+
+    def play_pos(self, channel: int) -> Optional[tuple[int, int]]:
+        return pyxel.play_pos(channel)
+
+    def stop(self, channel: int):
+        pyxel.stop(channel)
+
+    def set_draw_target(self, image: Optional[Any]):
+        self._canvas = image if image else pyxel
+
+    def camera(self):
+        pyxel.camera()
+
+    def cls(self, col: int):
+        self._canvas.cls(col)
+
+    def pset(self, x: float, y: float, col: int):
+        self._canvas.pset(x, y, col)
+
+    def rect(self, x: float, y: float, w: float, h: float, col: int):
+        self._canvas.rect(x, y, w, h, col)
+
+    def rectb(self, x: float, y: float, w: float, h: float, col: int):
+        self._canvas.rectb(x, y, w, h, col)
+
+    def text(self, x: float, y: float, s: str, col: int):
+        self._canvas.text(x, y, s, col)
+
+    def blt(self, x: float, y: float, img: int | Any, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        self._canvas.blt(x, y, img, u, v, w, h, colkey)
+
+    def bltm(self, x: float, y: float, tm: int, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        self._canvas.bltm(x, y, tm, u, v, w, h, colkey)
+
+    def load_image(self, img: int, x: int, y: int, path: str):
+        pyxel.image(img).load(x, y, path)
+
+    def decode_image(self, path: str) -> Any:
+        return pyxel.Image.from_image(path)
+
+    def copy_image(self, img: int, x: int, y: int, image: Any):
+        pyxel.image(img).blt(x, y, image, 0, 0, image.width, image.height)
+
+    def copy_image_data(self, img: int, x: int, y: int, width: int, height: int, data: bytes | memoryview):
+        # Write straight to the image bank's memory (which is also one byte per pixel)
+        image = pyxel.image(img)
+        address = ctypes.cast(image.data_ptr(), ctypes.c_void_p).value
+        view = memoryview(data)
+        source_type = ctypes.c_ubyte * len(view)
+        source = source_type.from_buffer_copy(view) if view.readonly else source_type.from_buffer(view)
+        source_address = ctypes.addressof(source)
+        copy_width = min(width, image.width - x)
+        copy_height = min(height, image.height - y)
+        if x == 0 and copy_width == width == image.width:
+            ctypes.memmove(address + y * image.width, source_address, width * copy_height)
+            return
+        for row in range(copy_height):
+            ctypes.memmove(address + (y + row) * image.width + x, source_address + row * width, copy_width)
+
+    def create_image(self, width: int, height: int) -> Any:
+        return pyxel.Image(width, height)
+
+    def image_pset(self, image: Any, x: int, y: int, col: int):
+        image.pset(x, y, col)
+
+    def tilemap_pget(self, tm: int, x: int, y: int) -> tuple[int, int]:
+        return pyxel.tilemap(tm).pget(x, y)
+
+    def tilemap_pset(self, tm: int, x: int, y: int, uv: tuple[int, int]):
+        pyxel.tilemap(tm).pset(x, y, uv)
+
+class HeadlessBackend(Backend):
+    """
+    A backend without a window. Drawing and audio are no-ops, while input is taken from a script.
+
+    The script maps a frame number to the keys held down on that frame, like so:
+    ```
+    {
+        0: [pyxel.KEY_SPACE],
+        1: [pyxel.KEY_SPACE, pyxel.KEY_UP],
+        2: [] # release everything
+    }
+    ```
+    Keys are kept held down until the next frame listed in the script. Tilemaps are read from the resource file so levels still work.
+    """
+
+    def __init__(self, script: Optional[dict[int, list[int]]] = None, ticks: int = 0):
+        self.script = script if script else {}
+        self.ticks = ticks # amount of frames to run when `run` is called
+        self.fps = 30
+        self.running = False
+        self.keys_held: set[int] = set()
+        self._key_press_frame: dict[int, int] = {}
+        self._frame_count = 0
+        self.tilemaps: dict[int, list[list[tuple[int, int]]]] = {}
+        self.draw_target: Optional[Any] = None
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    def init(self, width: int, height: int, title: str, fps: int):
+        self.fps = fps
+
+    def load_resources(self, path: str, image: bool = True, tilemap: bool = True, sound: bool = True, music: bool = True):
+        if not tilemap:
+            return
+        with zipfile.ZipFile(path) as resource_file:
+            for name in resource_file.namelist():
+                if not name.startswith("pyxel_resource/tilemap"):
+                    continue
+                rows = resource_file.read(name).decode().splitlines()[:TILEMAP_SIZE] # the last line is the tilemap's image bank
+                self.tilemaps[int(name.removeprefix("pyxel_resource/tilemap"))] = [
+                    [(int(row[i:i + 2], 16), int(row[i + 2:i + 4], 16)) for i in range(0, len(row), 4)] for row in rows
+                ]
+
+    def set_keys_held(self, keys: list[int]):
+        """
+        Set the keys held down, starting from this frame.
+        """
+        for key in keys:
+            if key not in self.keys_held:
+                self._key_press_frame[key] = self._frame_count
+        self.keys_held = set(keys)
+
+    def step(self, update: Callable[[], None], draw: Optional[Callable[[], None]] = None):
+        """
+        Run a single frame.
+        """
+        if self._frame_count in self.script:
+            self.set_keys_held(self.script[self._frame_count])
+        update()
+        draw() if draw else None
+        self._frame_count += 1
+
+    def run(self, update: Callable[[], None], draw: Callable[[], None]):
+        self.running = True
+        for _ in range(self.ticks):
+            if not self.running:
+                break
+            self.step(update, draw)
+        self.running = False
+
+    def quit(self):
+        self.running = False
+
+    def btn(self, key: int) -> bool:
+        return key in self.keys_held
+
+    def btnp(self, key: int, hold: Optional[int] = None, repeat: Optional[int] = None) -> bool:
+        if key not in self.keys_held:
+            return False
+        return is_key_repeated(self._frame_count - self._key_press_frame[key], hold, repeat)
+
+    def play(self, channel: int, idx: int, loop: bool = False):
+        pass
+
+    def playm(self, idx: int, loop: bool = False):
+        pass
+
+    def play_pos(self, channel: int) -> Optional[tuple[int, int]]:
+        return None
+
+    def stop(self, channel: int):
+        pass
+
+    def set_draw_target(self, image: Optional[Any]):
+        self.draw_target = image
+
+    def camera(self):
+        pass
+
+    def cls(self, col: int):
+        pass
+
+    def pset(self, x: float, y: float, col: int):
+        pass
+
+    def rect(self, x: float, y: float, w: float, h: float, col: int):
+        pass
+
+    def rectb(self, x: float, y: float, w: float, h: float, col: int):
+        pass
+
+    def text(self, x: float, y: float, s: str, col: int):
+        pass
+
+    def blt(self, x: float, y: float, img: int | Any, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        pass
+
+    def bltm(self, x: float, y: float, tm: int, u: float, v: float, w: float, h: float, colkey: Optional[int] = None):
+        pass
+
+    def load_image(self, img: int, x: int, y: int, path: str):
+        pass
+
+    def decode_image(self, path: str) -> Any:
+        with open(path, "rb") as image_file: # still read the file, so disk I/O can be measured
+            return image_file.read()
+
+    def copy_image(self, img: int, x: int, y: int, image: Any):
+        pass
+
+    def copy_image_data(self, img: int, x: int, y: int, width: int, height: int, data: bytes | memoryview):
+        pass
+
+    def create_image(self, width: int, height: int) -> Any:
+        return [[0] * width for _ in range(height)] # rows of colors, so what was drawn can still be inspected
+
+    def image_pset(self, image: Any, x: int, y: int, col: int):
+        if 0 <= y < len(image) and 0 <= x < len(image[y]):
+            image[y][x] = col
+
+    def _get_tilemap(self, tm: int) -> list[list[tuple[int, int]]]:
+        if tm not in self.tilemaps:
+            self.tilemaps[tm] = [[(0, 0)] * TILEMAP_SIZE for _ in range(TILEMAP_SIZE)]
+        return self.tilemaps[tm]
+
+    def tilemap_pget(self, tm: int, x: int, y: int) -> tuple[int, int]:
+        if not (0 <= x < TILEMAP_SIZE and 0 <= y < TILEMAP_SIZE):
+            return (0, 0)
+        return self._get_tilemap(tm)[y][x]
+
+    def tilemap_pset(self, tm: int, x: int, y: int, uv: tuple[int, int]):
+        if not (0 <= x < TILEMAP_SIZE and 0 <= y < TILEMAP_SIZE):
+            return
+        self._get_tilemap(tm)[y][x] = uv
+
+# The active backend
+_backend: Backend = PyxelBackend()
+
+def get() -> Backend:
+    """
+    Get the active backend.
+    """
+    return _backend
+
+def set_backend(new_backend: Backend):
+    """
+    Set the active backend. Should be called before anything is initialized.
+    """
+    global _backend
+    _backend = new_backend
@@ -24,12 +24,14 @@ Common constants and classes.
 # nvm, you can just pass values to components and then the component is gonna construct the classes from this file
 
 import pyxel
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Generic, Optional, TypeVar
 from time import time
 
 from game.config import *
+from . import backend
 
 """
 Common classes and functions for many files including utilities.
@@ -87,6 +89,62 @@ class KeyFunc:
     hold_time: Optional[int] = None
     repeat_time: Optional[int] = None
 
+@dataclass
+class DispatchStats:
+    """
+    Event dispatch counters for a single frame.
+    """
+    dispatches: int = 0 # all event triggers
+    compiled_dispatches: int = 0 # triggers that went through a precompiled dispatcher (no results list, no double scan)
+    positional_dispatches: int = 0 # triggers that passed positional arguments instead of unpacking a dict
+
+@dataclass
+class HudStats:
+    """
+    HUD layer counters.
+    """
+    frames: int = 0 # frames the HUD layer has been drawn to the screen
+    redraws: int = 0 # times the HUD layer image itself had to be redrawn
+
+@dataclass
+class ProfileStats:
+    """
+    Rolling timing stats of a profiled component, in milliseconds.
+    """
+    mean: float
+    p95: float
+    max: float
+
+@dataclass
+class SimulationLOD:
+    """
+    A level of detail for simulating entities: entities at least `min_distance` pixels (vertically) away from the camera
+    are only simulated every `update_interval` frames.
+    """
+    min_distance: float
+    update_interval: int
+
+@dataclass
+class SimulationLODStats:
+    """
+    Simulation level of detail counters for a single frame.
+    """
+    entities_per_level: list[int] # amount of entities in each level of detail
+    full_updates: int = 0 # entities updated normally
+    coarse_updates: int = 0 # entities updated with a coarse step
+    coarse_steps: int = 0 # simulation steps done by the coarse updates
+
+@dataclass
+class PoolStats:
+    """
+    Counters of an `EntityPool`.
+    """
+    capacity: int
+    high_water_mark: int = 0 # most entities that were live at the same time
+    acquired: int = 0
+    released: int = 0
+    overflows: int = 0 # acquires that failed because the pool was full
+
 @dataclass
 class Sfx():
     """
@@ -161,12 +219,26 @@ class TextStatusbarItem:
 
     def __post_init__(self):
         self.string: str = ""
+        self.dirty = True # whether the string needs to be refreshed (on the next `GameStatusbar.update`)
+
+    def invalidate(self):
+        """
+        Mark the item as outdated, so its function gets called again on the next statusbar update.
+        """
+        self.dirty = True
 
-    def update(self):
-        self.string = self.function()
+    def update(self) -> bool:
+        """
+        Refresh the string. Returns `True` if it has changed.
+        """
+        string = self.function()
+        changed = string != self.string
+        self.string = string
+        self.dirty = False
+        return changed
 
     def draw(self):
-        pyxel.text(self.x, self.y, self.string, self.color)
+        backend.get().text(self.x, self.y, self.string, self.color)
 
 @dataclass
 class ProgressStatusbarItem:
@@ -191,6 +263,9 @@ class ProgressStatusbarItem:
 
     def __post_init__(self):
         self._recalculate()
+        self.dirty = True # whether the value needs to be refreshed (on the next `GameStatusbar.update`)
+        self.value = 0
+        self._drawn_state: Optional[tuple[int, int, int, int, Optional[Icon]]] = None # what the last update showed
         self.height = 0
         self.text_x = self.x
         self.text_y = self.y
@@ -201,6 +276,13 @@ class ProgressStatusbarItem:
         """
         self.max_val = max_val
         self._recalculate()
+        self.dirty = True
+
+    def invalidate(self):
+        """
+        Mark the item as outdated, so its function gets called again on the next statusbar update.
+        """
+        self.dirty = True
 
     def _recalculate(self):
         try:
@@ -231,29 +313,71 @@ class ProgressStatusbarItem:
 
     def _draw_text_over_bar(self):
         if self.text_over_bar:
-            pyxel.text(self.text_x, self.text_y, self.text_over_bar, self.text_over_bar_col)
+            backend.get().text(self.text_x, self.text_y, self.text_over_bar, self.text_over_bar_col)
 
     def _draw_icon_if_icon(self):
         if self.icon:
-            pyxel.blt(self.x, self.y, self.icon.img, self.icon.u, self.icon.v, self.icon.w, self.icon.h, self.icon.colkey)
+            backend.get().blt(self.x, self.y, self.icon.img, self.icon.u, self.icon.v, self.icon.w, self.icon.h, self.icon.colkey)
 
-    def update(self):
+    def update(self) -> bool:
+        """
+        Refresh the value. Returns `True` if the bar looks different now (value, colors, icon or max value).
+        """
         self.value = self.function()
+        state = (self.value, self.max_val, self.border_col, self.progress_col, self.icon)
+        changed = state != self._drawn_state
+        self._drawn_state = state
+        self.dirty = False
+        return changed
 
     def draw(self):
-        pyxel.rectb(self.bar_x, self.bar_y, self.bar_width, self.bar_height, self.border_col) # border
-        pyxel.rect(self.bar_x + 1, self.bar_y + 1, self.value * self.pixels_per_val, self.bar_height - 2, self.progress_col) # progress
+        backend.get().rectb(self.bar_x, self.bar_y, self.bar_width, self.bar_height, self.border_col) # border
+        backend.get().rect(self.bar_x + 1, self.bar_y + 1, self.value * self.pixels_per_val, self.bar_height - 2, self.progress_col) # progress
         self._draw_icon_if_icon()
         self._draw_text_over_bar()
     
+# Clocks
+class Clock(ABC):
+    """
+    A clock used by timers.
+    """
+    @abstractmethod
+    def now(self) -> float:
+        """
+        Get the current time in seconds.
+        """
+
+class WallClock(Clock):
+    """
+    A clock that follows the real (wall-clock) time.
+    """
+    def now(self) -> float:
+        return time()
+
+class FrameClock(Clock):
+    """
+    A clock derived from the frame count and the FPS. Time only moves when the game is ticked, so timers behave
+    the same no matter how fast the game loop actually runs (useful for fast-forwarded or headless runs).
+    """
+    def __init__(self, fps: int = FPS):
+        self.fps = fps
+
+    def now(self) -> float:
+        return backend.get().frame_count / self.fps
+
+WALL_CLOCK = WallClock()
+
 class TimerItem:
     """
     A Timer item.
     """
-    def __init__(self, time_limit: float, timer_id: str = "timer_item"):
+    def __init__(self, time_limit: float, timer_id: str = "timer_item", clock: Clock = WALL_CLOCK):
         self.timer_id = timer_id
         self.time_limit = time_limit
-        self.start_timestamp = time()
+        self.clock = clock
+        self.start_timestamp = clock.now()
+        self.deadline = self.start_timestamp + time_limit
+        self.cancelled = False
         self._function_when_over: Optional[Callable[[], None]] = None
 
     def when_over(self, function: Callable[[], None]):
@@ -267,7 +391,7 @@ class TimerItem:
         Check whether the timer is over.
         """
         
-        time_now = time()
+        time_now = self.clock.now()
         return time_now - self.start_timestamp > self.time_limit
 
     def run_function(self):
@@ -283,19 +407,21 @@ class TickerItem:
 
     The `get` method from this class will return `True` on every `frame_limit` frames.
     """
-    def __init__(self, frame_limit: int):
+    def __init__(self, frame_limit: int, handle: int = -1, group: str = "global"):
         """
         Initialize a new tick timer for an entity.
         """
         self.time_since_last_move = 0
         self.time_last_frame = 0
         self.limit = frame_limit
+        self.handle = handle # set by the `TickerHandler`, used to detach the ticker
+        self.group = group
     
     def tick(self):
         """
         Update tick counts. Should be run on every game tick.
         """
-        time_this_frame = pyxel.frame_count
+        time_this_frame = backend.get().frame_count
         self.dt = time_this_frame - self.time_last_frame
         self.time_last_frame = time_this_frame
         self.time_since_last_move += self.dt
@@ -309,3 +435,209 @@ class TickerItem:
             return True
         return False
 
+    def reset(self):
+        """
+        Start counting from the current frame, as if the ticker had just been created.
+        """
+        self.time_last_frame = backend.get().frame_count
+        self.time_since_last_move = 0
+
+    def take(self) -> int:
+        """
+        Get the amount of ticks that have passed since the last `get`/`take` and reset the count (keeping the leftover frames).
+        For when `get` isn't called on every frame.
+        """
+        ticks = int(self.time_since_last_move // self.limit)
+        self.time_since_last_move -= ticks * self.limit
+        return ticks
+
+
+# Spatial hashing
+class SpatialHash:
+    """
+    A uniform grid used as a broad phase for collision checks. Objects are inserted along with their bounding box,
+    and a query only returns objects that share at least one cell with the queried box.
+
+    The query result is only a list of *candidates*; do the actual collision check on them afterwards.
+    """
+    def __init__(self, cell_size: int = 16):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        """
+        Remove every object from the grid.
+        """
+        self.cells: dict[tuple[int, int], list[Any]] = {}
+        self._object_cells: dict[int, list[tuple[int, int]]] = {}
+        self._insertion_order: dict[int, int] = {}
+        self._insertion_counter = 0
+
+    def _cell_range(self, x: float, y: float, w: float, h: float) -> list[tuple[int, int]]:
+        cell_x_start = int(x // self.cell_size)
+        cell_x_end = int((x + w) // self.cell_size)
+        cell_y_start = int(y // self.cell_size)
+        cell_y_end = int((y + h) // self.cell_size)
+        return [(cell_x, cell_y) for cell_x in range(cell_x_start, cell_x_end + 1) for cell_y in range(cell_y_start, cell_y_end + 1)]
+
+    def insert(self, obj: Any, x: float, y: float, w: float, h: float):
+        """
+        Insert an object with its bounding box to the grid.
+        """
+        cells = self._cell_range(x, y, w, h)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(obj)
+        self._object_cells[id(obj)] = cells
+        self._insertion_order[id(obj)] = self._insertion_counter
+        self._insertion_counter += 1
+
+    def remove(self, obj: Any):
+        """
+        Remove an object from the grid. Does nothing if the object isn't in the grid.
+        """
+        cells = self._object_cells.pop(id(obj), None)
+        if cells is None:
+            return
+        del self._insertion_order[id(obj)]
+        for cell in cells:
+            self.cells[cell].remove(obj)
+
+    def query(self, x: float, y: float, w: float, h: float) -> list[Any]:
+        """
+        Get objects that are near the specified bounding box, in the same order as they were inserted.
+        """
+        candidates: dict[int, Any] = {}
+        for cell in self._cell_range(x, y, w, h):
+            for obj in self.cells.get(cell, ()):
+                candidates[id(obj)] = obj
+        if len(candidates) <= 1:
+            return list(candidates.values())
+        return sorted(candidates.values(), key=lambda obj: self._insertion_order[id(obj)])
+
+class RowIndex:
+    """
+    Objects bucketed into rows by their y coordinate. Since the game only scrolls vertically, a query for a horizontal band
+    (like the viewport) only has to look at the rows covering that band, no matter how tall the level is.
+
+    Objects have to be moved with `move` whenever their y coordinate changes. Query results keep the insertion order.
+    """
+    def __init__(self, row_height: int = 32):
+        self.row_height = row_height
+        self.clear()
+
+    def clear(self):
+        """
+        Remove every object from the index.
+        """
+        self.rows: dict[int, dict[int, Any]] = {} # row -> {insertion order: object}
+        self._object_rows: dict[int, tuple[int, int]] = {} # object id -> (row, insertion order)
+        self._insertion_counter = 0
+
+    def __len__(self) -> int:
+        return len(self._object_rows)
+
+    def insert(self, obj: Any, y: float):
+        """
+        Add an object at the y coordinate `y`.
+        """
+        row = int(y // self.row_height)
+        self.rows.setdefault(row, {})[self._insertion_counter] = obj
+        self._object_rows[id(obj)] = (row, self._insertion_counter)
+        self._insertion_counter += 1
+
+    def move(self, obj: Any, y: float):
+        """
+        Update the row of an object after its y coordinate has changed.
+        """
+        new_row = int(y // self.row_height)
+        row, order = self._object_rows[id(obj)]
+        if new_row == row:
+            return
+        del self.rows[row][order]
+        self.rows.setdefault(new_row, {})[order] = obj
+        self._object_rows[id(obj)] = (new_row, order)
+
+    def remove(self, obj: Any):
+        """
+        Remove an object from the index. Does nothing if the object isn't in the index.
+        """
+        location = self._object_rows.pop(id(obj), None)
+        if location is None:
+            return
+        row, order = location
+        del self.rows[row][order]
+
+    def query(self, y_start: float, y_end: float) -> list[Any]:
+        """
+        Get objects within the rows covering `y_start` to `y_end`, in the same order as they were inserted.
+        The rows might stick out of the band, so check the actual coordinates afterwards if needed.
+        """
+        found: list[tuple[int, Any]] = []
+        for row in range(int(y_start // self.row_height), int(y_end // self.row_height) + 1):
+            row_objects = self.rows.get(row)
+            found.extend(row_objects.items()) if row_objects else None
+        found.sort(key=lambda entry: entry[0])
+        return [obj for _, obj in found]
+
+# Entity pool
+T = TypeVar("T")
+
+class EntityPool(Generic[T]):
+    """
+    A fixed-capacity pool of entity slots. `acquire` hands out a free slot and `release` gives it back, so spawning and
+    despawning entities doesn't allocate anything. If `factory` is given, an entity is created for every slot up front
+    (`entities[slot]`) and reused by whoever acquires the slot; otherwise the slots are meant to index the caller's own arrays.
+
+    A slot stays the same for as long as it's acquired. The acquired slots are kept packed in `active_slots`; releasing one moves
+    the last active slot into its place (swap-remove), so `active_slots` isn't in acquisition order. To release slots while
+    going through `active_slots`, go backwards.
+    """
+    def __init__(self, capacity: int, factory: Optional[Callable[[], T]] = None):
+        self.capacity = capacity
+        self.entities: list[T] = [factory() for _ in range(capacity)] if factory else []
+        self.stats = PoolStats(capacity)
+        self.clear()
+
+    def clear(self):
+        """
+        Release every slot.
+        """
+        self.active_slots: list[int] = []
+        self._free_slots = list(range(self.capacity - 1, -1, -1)) # taken from the end, so the lowest slots go first
+        self._active_idx = [-1] * self.capacity # slot -> index in `active_slots`, -1 if the slot is free
+
+    def __len__(self) -> int:
+        return len(self.active_slots)
+
+    def acquire(self) -> int:
+        """
+        Take a free slot. Returns -1 if the pool is full.
+        """
+        if not self._free_slots:
+            self.stats.overflows += 1
+            return -1
+        slot = self._free_slots.pop()
+        self._active_idx[slot] = len(self.active_slots)
+        self.active_slots.append(slot)
+        self.stats.acquired += 1
+        if len(self.active_slots) > self.stats.high_water_mark:
+            self.stats.high_water_mark = len(self.active_slots)
+        return slot
+
+    def release(self, slot: int):
+        """
+        Give a slot back to the pool. Does nothing if the slot is already free.
+        """
+        idx = self._active_idx[slot]
+        if idx < 0:
+            return
+        last_slot = self.active_slots.pop()
+        if last_slot != slot:
+            self.active_slots[idx] = last_slot
+            self._active_idx[last_slot] = idx
+        self._active_idx[slot] = -1
+        self._free_slots.append(slot)
+        self.stats.released += 1
+
+    def is_active(self, slot: int) -> bool:
+        return self._active_idx[slot] >= 0
@@ -18,8 +18,9 @@ Game components such as camera, sound player, key listener, etc.
 
 # Imports
 import pyxel
+import heapq
 from time import time
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 
 from .common import (
@@ -31,79 +32,149 @@ from .common import (
     LevelMap,
     TextStatusbarItem,
     ProgressStatusbarItem,
+    ALPHA_COL,
+    DispatchStats,
+    HudStats,
     TimerItem,
     TickerItem,
+    Clock,
+    WALL_CLOCK,
+    MAP_Y_OFFSET_TILES,
     WINDOW_WIDTH,
     WINDOW_HEIGHT
 )
 
-from game.events import Event
+from game.events import Event, FrameEvent
 from core.sprite_classes import Sprite, SpriteHandler, TilemapBasedSprite
 from core.game_ui_classes import UIComponent
 from . import utils
+from . import backend
+from .backend import Backend
+from .replay import InputRecorder, InputReplayer
+from .tracer import EventTracer
 
 # Keyboard input handling
 class KeyListener:
     """
-    A Key listener to execute functions. Operates with an array like this:
-    ```
-    [
-        {
-            "a_function": KeyFunc,
-            "other_function": KeyFunc
-        } 
-        { 
-            "a_function": KeyFunc,
-            "other_function": KeyFunc
-        }
-    ]
-    ```
+    A Key listener to execute functions. Each `KeyFunc` is registered under a name, and the functions are checked in the order
+    they were added (adding a name that already exists replaces the old `KeyFunc` and moves it to the end).
+
+    The bindings are compiled into a table: every distinct physical key gets a bit, and each `KeyFunc` gets the mask of its keys.
+    On each check, every key is polled once (even if several functions are bound to it) into a bitmask of the held keys,
+    and only the functions whose mask matches are looked at. The table is rebuilt whenever a function is added, removed or rebound,
+    so change a binding through `rebind` instead of assigning to `KeyFunc.binding`.
     """
 
     def __init__(self):
-        self.keys_to_check: list[dict[str, KeyFunc]] = []
+        self.keyfuncs: dict[str, KeyFunc] = {}
+        self.input_recorder: Optional[InputRecorder] = None
+        self.input_replayer: Optional[InputReplayer] = None
+        self._key_bits: dict[int, int] = {} # physical key -> its bit in the held keys mask
+        self._table: list[tuple[KeyFunc, int, list[tuple[int, int]]]] = [] # (keyfunc, mask of its keys, [(key, bit)])
+        self._table_dirty = False
+
+    def start_recording(self, recorder: InputRecorder):
+        """
+        Record the keys held down on every check from now on.
+        """
+        self.input_recorder = recorder
+
+    def start_replay(self, replayer: InputReplayer):
+        """
+        Take the keys from a replay instead of the backend from now on.
+        """
+        self.input_replayer = replayer
 
     def add(self, name: str, keyfunc: KeyFunc):
         """
-        Add a new `KeyFunc`s.
+        Add a new `KeyFunc`.
         """
-        self.keys_to_check.append({name: keyfunc})
+        self.keyfuncs.pop(name, None)
+        self.keyfuncs[name] = keyfunc
+        self._table_dirty = True
     
     def append(self, keyfunc_list: list[dict[str, KeyFunc]]):
         """
         Append (extend) a new list of dict containing `KeyFunc`s.
         """
-        self.keys_to_check.extend(keyfunc_list)
+        for keyfuncs in keyfunc_list:
+            for name, keyfunc in keyfuncs.items():
+                self.add(name, keyfunc)
+
+    def remove(self, name: str):
+        """
+        Remove a `KeyFunc`. Does nothing if there's no `KeyFunc` with that name.
+        """
+        if self.keyfuncs.pop(name, None):
+            self._table_dirty = True
+
+    def set_active(self, name: str, active: bool):
+        """
+        Enable or disable a `KeyFunc` (same as setting its `active`).
+        """
+        self.keyfuncs[name].active = active
+
+    def rebind(self, name: str, binding: list[int]):
+        """
+        Change the keys of a `KeyFunc`.
+        """
+        self.keyfuncs[name].binding = binding
+        self._table_dirty = True
+
+    def _compile(self):
+        key_bits: dict[int, int] = {}
+        table: list[tuple[KeyFunc, int, list[tuple[int, int]]]] = []
+        for keyfunc in self.keyfuncs.values():
+            keys: list[tuple[int, int]] = []
+            mask = 0
+            for key in keyfunc.binding:
+                bit = key_bits.setdefault(key, 1 << len(key_bits))
+                keys.append((key, bit))
+                mask |= bit
+            table.append((keyfunc, mask, keys))
+        self._key_bits = key_bits
+        self._table = table
+        self._table_dirty = False
 
     def check(self):
         """
-        Loop through key listeners and run function if key is pressed.
+        Poll the keys and run the functions of the pressed ones.
         """
-        for i in self.keys_to_check:
-            for keyfunc in i.values():
-                if not keyfunc.active:
-                    continue
+        input_source: Backend | InputReplayer = backend.get()
+        if self.input_replayer:
+            self.input_replayer.next_frame()
+            input_source = self.input_replayer
+        self._compile() if self._table_dirty else None
+
+        held = 0
+        for key, bit in self._key_bits.items():
+            if input_source.btn(key):
+                held |= bit
+        self.input_recorder.record(sorted(key for key, bit in self._key_bits.items() if held & bit)) if self.input_recorder else None
+        if not held: # btnp can't be true either
+            return
+
+        for keyfunc, mask, keys in self._table:
+            if not held & mask or not keyfunc.active:
+                continue
 
-                match keyfunc.btn_type:
-                    case KeyType.BTN:
-                        for key in keyfunc.binding:
-                            if not pyxel.btn(key):
-                                continue
-                            keyfunc.func()
-                            break # don't execute another function if 2 keys (still same keyfunc) are pressed at the same time
+            match keyfunc.btn_type:
+                case KeyType.BTN:
+                    keyfunc.func() # only once, even if 2 keys (still same keyfunc) are pressed at the same time
 
-                    case KeyType.BTNP:
-                        for key in keyfunc.binding:
-                            if not pyxel.btnp(key, hold=keyfunc.hold_time, repeat=keyfunc.repeat_time):
-                                continue
-                            keyfunc.func()
-                            break
+                case KeyType.BTNP:
+                    for key, bit in keys:
+                        if not held & bit or not input_source.btnp(key, hold=keyfunc.hold_time, repeat=keyfunc.repeat_time):
+                            continue
+                        keyfunc.func()
+                        break
 
     def destroy_all(self):
         """
-        Empty list of keys to check.
+        Remove all `KeyFunc`s.
         """ 
-        self.keys_to_check = []
+        self.keyfuncs = {}
+        self._table_dirty = True
 
 
 # Camera handling
@@ -120,10 +191,10 @@ class Camera:
     dir_y: float = 0
 
     def __init__(self):
-       pyxel.camera()
+       backend.get().camera()
   
     def draw(self, levelmap: LevelMap):
-        pyxel.bltm(0, 0, 0, self.x + utils.tile_to_real(levelmap.map_x), self.y + utils.tile_to_real(levelmap.map_y), WINDOW_WIDTH, WINDOW_HEIGHT, pyxel.COLOR_BLACK)
+        backend.get().bltm(0, 0, 0, self.x + utils.tile_to_real(levelmap.map_x), self.y + utils.tile_to_real(levelmap.map_y), WINDOW_WIDTH, WINDOW_HEIGHT, pyxel.COLOR_BLACK)
 
 # Statusbar handling
 class GameStatusbar:
@@ -131,8 +202,9 @@ class GameStatusbar:
     Game statusbar which holds an array of items (`StatusBarItem`) to be displayed.
     """
     # The statusbar is being drawn constantly but not updated constantly.
-    # The `update` method calls all function and stores it in an array of strings, which will be drawn
-    # with the `draw` method.
+    # Items are marked as dirty (with `invalidate`) when their value changes, and the `update` method only calls the
+    # functions of the dirty items, so any amount of invalidations within a frame ends up as one refresh. `draw` only draws
+    # the current values; call `update` before it (the HUD layer does).
     def __init__(self):
         self.items: list[TextStatusbarItem | ProgressStatusbarItem] = []
         self.strings: list[str] = []
@@ -159,14 +231,27 @@ class GameStatusbar:
         """
         self.items = []
 
-    # XXX maybe a way to only update a particular statusbar item is useful.
-    def update(self):
+    def invalidate(self, item: Optional[TextStatusbarItem | ProgressStatusbarItem] = None):
         """
-        Update statusbar strings (call all functions used to get the string).
+        Mark a statusbar item (or every item, if none is specified) as outdated.
+        """
+        if item:
+            item.invalidate()
+            return
+
+        for item in self.items:
+            item.invalidate()
+
+    def update(self) -> bool:
+        """
+        Update statusbar strings (call the functions of outdated items). Returns `True` if anything displayed has changed.
         """
         
+        changed = False
         for item in self.items:
-            item.update()
+            if item.dirty:
+                changed = item.update() or changed
+        return changed
 
     def draw(self):
         """
@@ -216,20 +301,20 @@ class SoundPlayer():
         """
         match sfx.soundtype:
             case SoundType.AUDIO:
-                pyxel.play(sfx.channel, sfx.idx, loop=loop)
+                backend.get().play(sfx.channel, sfx.idx, loop=loop)
             case SoundType.MUSIC:
-                pyxel.playm(sfx.idx, loop=loop)
+                backend.get().playm(sfx.idx, loop=loop)
 
     def is_playing(self, sfx: Sfx) -> bool:
-        if pyxel.play_pos(sfx.channel) == None:
+        if backend.get().play_pos(sfx.channel) == None:
             return False
         return True
 
     def stop_sfx_channel_playback(self, sfx: Sfx):
-        pyxel.stop(sfx.channel)
+        backend.get().stop(sfx.channel)
 
     def stop_channel_playback(self, channel: int):
-        pyxel.stop(channel)
+        backend.get().stop(channel)
 
 # UI Components handling
 class GameUI():
@@ -245,7 +330,7 @@ class GameUI():
     
     def draw(self):
         for component in self.ui_components.values():
-            component.draw()
+            component.draw() if not component.on_hud_layer else None
     
     def init_level(self):
         for component in self.ui_components.values():
@@ -255,6 +340,60 @@ class GameUI():
         for component in self.ui_components.values():
             component.restart_level()
 
+# HUD handling
+class HudLayer:
+    """
+    An offscreen layer for the HUD (statusbar, healthbar, etc.).
+
+    Each HUD part is attached with an update function, which returns `True` if the part has changed, and a draw function.
+    The layer image is only redrawn (all parts at once) when a part has changed, so most frames only cost one blit.
+    """
+    LAYER_HEIGHT = 48 # enough for the statusbar and healthbar at the top of the screen
+
+    def __init__(self, colkey: int = ALPHA_COL):
+        self.colkey = colkey
+        self.image = backend.get().create_image(WINDOW_WIDTH, self.LAYER_HEIGHT)
+        self.parts: list[tuple[Callable[[], bool], Callable[[], None]]] = []
+        self.stats = HudStats()
+        self._needs_redraw = True
+
+    def attach(self, update: Callable[[], bool], draw: Callable[[], None]):
+        """
+        Attach a HUD part.
+        """
+        self.parts.append((update, draw))
+        self._needs_redraw = True
+
+    def invalidate(self):
+        """
+        Force the layer to be redrawn on the next frame.
+        """
+        self._needs_redraw = True
+
+    def _redraw(self):
+        gfx = backend.get()
+        gfx.set_draw_target(self.image)
+        try:
+            gfx.cls(self.colkey)
+            for _, draw in self.parts:
+                draw()
+        finally:
+            gfx.set_draw_target(None)
+        self.stats.redraws += 1
+        self._needs_redraw = False
+
+    def draw(self):
+        """
+        Draw the HUD, redrawing the layer first if any of the parts has changed.
+        """
+        changed = self._needs_redraw
+        for update, _ in self.parts:
+            changed = update() or changed # every part needs to be updated, so no short-circuiting here
+        self._redraw() if changed else None
+
+        backend.get().blt(0, 0, self.image, 0, 0, WINDOW_WIDTH, self.LAYER_HEIGHT, self.colkey)
+        self.stats.frames += 1
+
 # Sprites handling
 class GameSprites:
     """
@@ -345,34 +484,75 @@ class GameSprites:
         return statusbar_items
 
 # Ticker handler
+DEFAULT_TICKER_GROUP = "global"
+
 class TickerHandler:
     """
     Ticker handler class. Each individual sprite that has a ticker doesn't need to update the ticker
+
+    Ticker items are stored in groups. Short-lived tickers (e.g. ones owned by enemies or blasts) should be attached
+    to their own group so they can be released all at once (`release`) on level init/restart; a single ticker can be
+    removed with `detach`.
     """
     def __init__(self):
-        self.ticker_items: list[TickerItem] = []
+        self.ticker_groups: dict[str, dict[int, TickerItem]] = {}
+        self._next_handle = 0
     
-    def attach(self, limit: int) -> TickerItem:
-        ticker_item = TickerItem(limit)
-        self.ticker_items.append(ticker_item)
+    def attach(self, limit: int, group: str = DEFAULT_TICKER_GROUP) -> TickerItem:
+        """
+        Attach a new ticker item to `group`, counting from the current frame. The returned `TickerItem` is also the handle to detach it.
+        """
+        ticker_item = TickerItem(limit, self._next_handle, group)
+        ticker_item.reset() # otherwise the first `take` would count every frame since the game started
+        self._next_handle += 1
+        self.ticker_groups.setdefault(group, {})[ticker_item.handle] = ticker_item
         return ticker_item
+
+    def detach(self, ticker_item: TickerItem):
+        """
+        Stop updating a ticker item. Does nothing if the ticker item has already been detached.
+        """
+        group = self.ticker_groups.get(ticker_item.group)
+        if group:
+            group.pop(ticker_item.handle, None)
+
+    def release(self, group: str):
+        """
+        Detach all ticker items of a group.
+        """
+        self.ticker_groups.pop(group, None)
+
+    def get_live_counts(self) -> dict[str, int]:
+        """
+        Get the amount of live ticker items of each group.
+        """
+        return {group: len(items) for group, items in self.ticker_groups.items()}
     
     def update(self):
         """
         Update tick counts of all ticker items.
         """
-        for item in self.ticker_items:
-            item.tick()
+        for group in self.ticker_groups.values():
+            for item in group.values():
+                item.tick()
 
 # Timer system
 class Timer:
     """
     This timer provides a way to "wait" `limit` seconds and then run a process, without clogging up other processes. Has precision up to 1s ÷ <game FPS>.
+
+    The time is read from `clock`, which is the wall clock by default. Pass a `FrameClock` to make the timer depend on game ticks instead.
     """
 
-    def __init__(self):
+    # Timer items are kept in a min-heap ordered by their deadline, so an update only needs to look at the items that are
+    # actually over. Destroyed items are only marked as cancelled and then skipped when they come out of the heap.
+
+    def __init__(self, clock: Clock = WALL_CLOCK):
         self.time_start = time
-        self.timer_items: list[TimerItem] = []
+        self.clock = clock
+        self._timer_heap: list[tuple[float, int, TimerItem]] = []
+        self._timer_items_by_id: dict[str, dict[int, TimerItem]] = {}
+        self._timer_counter = 0 # tie breaker for items with the same deadline, so they run in the order they were attached
     
     def attach(self, limit: float, item_id: str = "timer_item") -> TimerItem:
         """
@@ -387,23 +567,48 @@ class Timer:
         The `id` variable is optional but useful because the `destroy` method of this game timer can then be called to delete all timer items with the specified `id`.
         """
 
-        timer_item = TimerItem(limit, item_id)
-        self.timer_items.append(timer_item)
+        timer_item = TimerItem(limit, item_id, self.clock)
+        heapq.heappush(self._timer_heap, (timer_item.deadline, self._timer_counter, timer_item))
+        self._timer_items_by_id.setdefault(item_id, {})[self._timer_counter] = timer_item
+        self._timer_counter += 1
         return timer_item
 
     def destroy_by_id(self, item_id: str):
-        for item in self.timer_items:
-            self.timer_items.remove(item) if item.timer_id == item_id else None
+        """
+        Cancel all timer items with the specified `id`.
+        """
+        timer_items = self._timer_items_by_id.pop(item_id, None)
+        if not timer_items:
+            return
+        for item in timer_items.values():
+            item.cancelled = True
+
+    def get_pending_count(self) -> int:
+        """
+        Get the amount of timer items that haven't run yet.
+        """
+        return sum(len(items) for items in self._timer_items_by_id.values())
 
     def update(self):
         """
-        Update status of all timer items (`self.timer_items`).
+        Run all timer items that are over.
         """
-        for item in self.timer_items:
-            if not item.is_over():
+        time_now = self.clock.now() # read the clock once per frame
+        timer_heap = self._timer_heap
+
+        # Items attached from inside a function that runs here start after `time_now`, so they can't be over
+        # yet and won't run until the next update.
+        while timer_heap and timer_heap[0][0] < time_now:
+            _, counter, item = heapq.heappop(timer_heap)
+            if item.cancelled: # the timer suddenly got removed
                 continue
+
+            timer_items = self._timer_items_by_id[item.timer_id]
+            del timer_items[counter]
+            if not timer_items:
+                del self._timer_items_by_id[item.timer_id]
+
             item.run_function()
-            self.timer_items.remove(item) if item in self.timer_items else None # don't do anything if the item is already gone (the timer suddenly got removed)
 
 # Event system
 class EventHandler:
@@ -419,11 +624,32 @@ class EventHandler:
     ```
 
     Handler function may return a boolean if needed. It will be passed as the result of the `trigger_event` method for the event sender.
+
+    With `compiled_dispatch` enabled, the handler list of each event is compiled into a single dispatcher function the first time
+    the event is triggered (and recompiled whenever its handlers change). The dispatcher passes positional arguments when the
+    event has them (see `events.FrameEvent`) and aggregates the results without building a list.
+
+    While an `EventTracer` is attached (`start_tracing`), every trigger goes through the tracer instead, which is slower but records
+    each event and handler call.
     """
     
-    def __init__(self):
+    def __init__(self, compiled_dispatch: bool = False):
         self.debug_mode = True
+        self.compiled_dispatch = compiled_dispatch
+        self.tracer: Optional[EventTracer] = None
         self._handlers: dict[str, list[Callable[..., bool | None]]] = {}
+        self._dispatchers: dict[str, Callable[..., bool | None]] = {}
+        self.dispatch_stats = DispatchStats() # stats of the current frame
+        self.last_frame_dispatch_stats = DispatchStats()
+
+    def start_tracing(self, tracer: EventTracer):
+        """
+        Record every event trigger with `tracer` from now on.
+        """
+        self.tracer = tracer
+
+    def stop_tracing(self):
+        self.tracer = None
     
     def add_handler(self, event_name: str, handler: Callable[..., bool | None]):
         """
@@ -432,6 +658,7 @@ class EventHandler:
         if event_name not in self._handlers:
             self._handlers[event_name] = []
         self._handlers[event_name].append(handler)
+        self._dispatchers.pop(event_name, None)
     
     def remove_handler(self, event_name: str, handler: Callable[..., Any]):
         """
@@ -439,17 +666,88 @@ class EventHandler:
         """
         if event_name in self._handlers and handler in self._handlers[event_name]:
             self._handlers[event_name].remove(handler)
-    
-    def trigger_event(self, event: Event) -> bool | None:
+            self._dispatchers.pop(event_name, None)
+
+    def next_frame(self):
+        """
+        Save the dispatch stats of the frame that just ended and start counting a new one. Should be run on every game tick.
+        """
+        self.last_frame_dispatch_stats = self.dispatch_stats
+        self.dispatch_stats = DispatchStats()
+        self.tracer.next_frame() if self.tracer else None
+
+    def _compile_dispatcher(self, event_name: str) -> Callable[..., bool | None]:
+        """
+        Compile the handler list of an event into a single function. The results follow the same rules as `trigger_event`.
+        """
+        handlers = tuple(self._handlers[event_name])
+
+        match len(handlers):
+            case 0:
+                def dispatch_none(*args: Any, **kwargs: Any) -> bool | None:
+                    return True
+                dispatcher = dispatch_none
+
+            case 1:
+                handler = handlers[0]
+                def dispatch_single(*args: Any, **kwargs: Any) -> bool | None:
+                    result = handler(*args, **kwargs)
+                    if result is None or result is True:
+                        return True
+                    return False if result is False else None
+                dispatcher = dispatch_single
+
+            case _:
+                def dispatch_many(*args: Any, **kwargs: Any) -> bool | None:
+                    failed = False
+                    undecided = False
+                    for handler in handlers:
+                        result = handler(*args, **kwargs)
+                        if failed or result is None or result is True: # once a handler failed, the other results don't matter anymore
+                            continue
+                        if result is False:
+                            failed = True
+                        else:
+                            undecided = True
+                    if failed:
+                        return False
+                    return None if undecided else True
+                dispatcher = dispatch_many
+
+        self._dispatchers[event_name] = dispatcher
+        return dispatcher
+
+    def trigger_event(self, event: Event | FrameEvent) -> bool | None:
         """
         Trigger an event.
         """
+        self.dispatch_stats.dispatches += 1
+
+        if self.tracer:
+            return self._trigger_traced_event(self.tracer, event)
+
+        if self.compiled_dispatch:
+            if event.name not in self._handlers:
+                return None
+
+            dispatcher = self._dispatchers.get(event.name) or self._compile_dispatcher(event.name)
+            self.dispatch_stats.compiled_dispatches += 1
+
+            if event.args is not None:
+                self.dispatch_stats.positional_dispatches += 1
+                return dispatcher(*event.args)
+            if event.data:
+                return dispatcher(**event.data)
+            return dispatcher()
+
         if event.name in self._handlers:
 
+            # Get the data once: reusable events (`FrameEvent`) might get their arguments replaced by a nested trigger.
+            data = event.data
             results: list[bool | None] = []
             for handler in self._handlers[event.name]:
-                if event.data:
-                    results.append(handler(**event.data)) # pass data from Event to handler function as a dict
+                if data:
+                    results.append(handler(**data)) # pass data from Event to handler function as a dict
                 else:
                     results.append(handler())
 
@@ -464,6 +762,105 @@ class EventHandler:
             else:
                 return True
 
+    def _trigger_traced_event(self, tracer: EventTracer, event: Event | FrameEvent) -> bool | None:
+        if event.name not in self._handlers:
+            return None
+
+        # Same rules for the result as `trigger_event`
+        args = event.args
+        if args is not None:
+            results = tracer.trace(event.name, tuple(self._handlers[event.name]), args, {})
+        else:
+            results = tracer.trace(event.name, tuple(self._handlers[event.name]), (), event.data or {})
+        if any(result is False for result in results):
+            return False
+        elif any(result is not None and result is not True for result in results):
+            return None
+        return True
+
+# Tilemap index
+class TileIndex:
+    """
+    Index of the tiles of each level, which maps a tile's U, V to a list of the coordinates where it's placed.
+    The coordinates are the _actual_ tile coordinates on the entire tilemap, not the game map coordinates.
+
+    The index of a level is built from the tilemap the first time it's requested and is then cached (also across restarts),
+    so it reflects the tilemap as it was when the level was first set up (e.g. before the enemy spawn points were cleared).
+    """
+    def __init__(self):
+        self._level_indexes: dict[int, dict[tuple[int, int], list[tuple[int, int]]]] = {}
+
+    def _build_level_index(self, levelmap: LevelMap) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        level_index: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        gfx = backend.get()
+        for y in range(levelmap.map_y + MAP_Y_OFFSET_TILES, levelmap.map_y + MAP_Y_OFFSET_TILES + levelmap.level_height):
+            for x in range(levelmap.map_x, levelmap.map_x + levelmap.level_width):
+                level_index.setdefault(gfx.tilemap_pget(0, x, y), []).append((x, y))
+        return level_index
+
+    def get_level_index(self, level: Level) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Get the tile index of a level.
+        """
+        level_index = self._level_indexes.get(level.idx)
+        if level_index is None:
+            level_index = self._build_level_index(level.levelmap)
+            self._level_indexes[level.idx] = level_index
+        return level_index
+
+    def get_tile_coords(self, level: Level, uv: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Get a list of coordinates of the tile `uv` in a level (row by row, from the top).
+        """
+        return list(self.get_level_index(level).get(uv, []))
+
+    def invalidate(self, level_idx: int):
+        """
+        Throw away the cached index of a level, so it'll get rebuilt from the current tilemap.
+        """
+        self._level_indexes.pop(level_idx, None)
+
+class TileWatchlist:
+    """
+    Tiles (actual tilemap coordinates) that something happens on when the player steps on them, like minerals and flags.
+    The tiles are kept in named groups: each handler sets the tiles of its own group on level setup and discards them when they're gone,
+    so the player only needs to read the tilemap (and trigger `TilemapPlayerCheck`) on these tiles.
+    """
+    def __init__(self):
+        self._groups: dict[str, set[tuple[int, int]]] = {}
+        self._watchers: dict[tuple[int, int], int] = {} # tile -> amount of groups watching it
+
+    def __contains__(self, tile: tuple[int, int]) -> bool:
+        return tile in self._watchers
+
+    def set_tiles(self, group: str, tiles: list[tuple[int, int]]):
+        """
+        Replace the tiles of a group.
+        """
+        for tile in list(self._groups.get(group, ())):
+            self.discard(group, tile)
+        for tile in tiles:
+            self.add(group, tile)
+
+    def add(self, group: str, tile: tuple[int, int]):
+        group_tiles = self._groups.setdefault(group, set())
+        if tile in group_tiles:
+            return
+        group_tiles.add(tile)
+        self._watchers[tile] = self._watchers.get(tile, 0) + 1
+
+    def discard(self, group: str, tile: tuple[int, int]):
+        """
+        Stop watching a tile for a group. Does nothing if the group isn't watching the tile.
+        """
+        group_tiles = self._groups.get(group)
+        if not group_tiles or tile not in group_tiles:
+            return
+        group_tiles.remove(tile)
+        self._watchers[tile] -= 1
+        if self._watchers[tile] <= 0:
+            del self._watchers[tile]
+
 # Level handling
 class LevelHandler:
     """
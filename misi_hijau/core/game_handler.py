@@ -28,7 +28,9 @@ from .components import (
     EventHandler,
     GameUI,
     TickerHandler,
-    Timer
+    Timer,
+    TileIndex,
+    TileWatchlist
 )
 
 @dataclass
@@ -45,6 +47,8 @@ class GameComponents:
     event_handler: EventHandler
     ticker: TickerHandler
     timer: Timer
+    tile_index: TileIndex
+    tile_watchlist: TileWatchlist
 
 # Manager of (almost) Everything here
 @dataclass
@@ -77,6 +81,7 @@ class GameHandler:
         """
         Update important components.
         """
+        self.game_components.event_handler.next_frame()
         self.game_components.keylistener.check()
         self.game_components.ticker.update()
         self.game_components.timer.update()
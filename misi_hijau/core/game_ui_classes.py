@@ -37,6 +37,7 @@ class UIComponent(ABC):
     w: int = 8
     h: int = 8
     active: bool = True
+    on_hud_layer: bool = False # if `True`, the component is drawn by the HUD layer instead of `GameUI.draw`
     keybindings: dict[str, common.KeyFunc] = field(default_factory=dict[str, common.KeyFunc])
     soundbank: dict[str, common.Sfx] = field(default_factory=dict[str, common.Sfx])
     costumes: dict[str, tuple[int, int]] = field(default_factory=dict[str, tuple[int, int]])
@@ -0,0 +1,128 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Frame profiler with an in-game overlay.
+"""
+
+import pyxel
+from collections import deque
+from time import perf_counter
+from typing import Any, Callable
+
+from .common import ProfileStats, WINDOW_HEIGHT
+from . import backend
+
+class FrameProfiler:
+    """
+    Measures how long the game's components take each frame.
+
+    Profiled methods are wrapped (on the instance) only while the profiler is enabled, and the original methods are put back
+    when it's disabled, so a disabled profiler doesn't slow anything down.
+    `get_targets` should return the `(label, object, method name)` of every method to profile. It's called again each frame
+    while the profiler is enabled, so objects created later (like sprites on game start) get picked up too.
+    """
+    SAMPLES_COUNT = 60 # amount of frames kept for the rolling stats
+    OVERLAY_BG_COL = pyxel.COLOR_BLACK
+    OVERLAY_TEXT_COL = pyxel.COLOR_LIME
+
+    def __init__(self, get_targets: Callable[[], list[tuple[str, Any, str]]]):
+        self.get_targets = get_targets
+        self.enabled = False
+        self.samples: dict[str, deque[float]] = {}
+        self._frame_times: dict[str, float] = {} # time spent by each label during the current frame
+        self._wrapped: dict[tuple[int, str], tuple[Any, str, Any, bool]] = {} # (object id, method name) -> (object, method name, original, was an instance attribute)
+
+    def toggle(self):
+        """
+        Enable the profiler if it's disabled, or disable it if it's enabled.
+        """
+        self.disable() if self.enabled else self.enable()
+
+    def enable(self):
+        self.enabled = True
+        self.samples = {}
+        self._frame_times = {}
+        self._wrap_targets()
+
+    def disable(self):
+        self.enabled = False
+        for obj, method_name, original, was_instance_attr in self._wrapped.values():
+            if was_instance_attr:
+                setattr(obj, method_name, original)
+            else:
+                delattr(obj, method_name)
+        self._wrapped = {}
+
+    def _wrap(self, label: str, obj: Any, method_name: str):
+        original = getattr(obj, method_name)
+        frame_times = self._frame_times
+
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                frame_times[label] = frame_times.get(label, 0) + perf_counter() - start
+
+        self._wrapped[(id(obj), method_name)] = (obj, method_name, original, method_name in vars(obj))
+        setattr(obj, method_name, profiled)
+
+    def _wrap_targets(self):
+        for label, obj, method_name in self.get_targets():
+            if (id(obj), method_name) not in self._wrapped:
+                self._wrap(label, obj, method_name)
+
+    def next_frame(self):
+        """
+        Store the timings of the frame that just ended. Should be called once at the end of every frame while the profiler is enabled.
+        """
+        for label, frame_time in self._frame_times.items():
+            if label not in self.samples:
+                self.samples[label] = deque(maxlen=self.SAMPLES_COUNT)
+            self.samples[label].append(frame_time)
+        self._frame_times.clear()
+        self._wrap_targets()
+
+    def get_stats(self) -> dict[str, ProfileStats]:
+        """
+        Get the rolling stats of every profiled label (in milliseconds).
+        """
+        stats: dict[str, ProfileStats] = {}
+        for label, samples in self.samples.items():
+            sorted_samples = sorted(samples)
+            p95_idx = min(len(sorted_samples) - 1, int(len(sorted_samples) * 0.95))
+            stats[label] = ProfileStats(
+                sum(sorted_samples) / len(sorted_samples) * 1000,
+                sorted_samples[p95_idx] * 1000,
+                sorted_samples[-1] * 1000
+            )
+        return stats
+
+    def draw(self):
+        """
+        Draw the overlay, then move on to the next frame.
+        """
+        stats = self.get_stats()
+        lines = [f"{'':22} mean  p95  max"]
+        lines.extend(f"{label[:22]:22}{stat.mean:5.1f}{stat.p95:5.1f}{stat.max:5.1f}" for label, stat in stats.items())
+
+        gfx = backend.get()
+        height = len(lines) * pyxel.FONT_HEIGHT + 4
+        y = WINDOW_HEIGHT - height
+        gfx.rect(0, y, 42 * pyxel.FONT_WIDTH + 4, height, self.OVERLAY_BG_COL)
+        for i, line in enumerate(lines):
+            gfx.text(2, y + 2 + i * pyxel.FONT_HEIGHT, line, self.OVERLAY_TEXT_COL)
+
+        self.next_frame()
@@ -0,0 +1,173 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Input recording and replay.
+
+A recording holds the random seed and the keys held down on each frame (as seen by `KeyListener.check`).
+Starting the game with the same seed and feeding the recorded keys back reproduces the session exactly, as long as the game's
+timer runs on a `FrameClock` both times.
+"""
+
+import struct
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .backend import is_key_repeated
+
+RECORDING_MAGIC = b"MHIR"
+RECORDING_VERSION = 1
+RECORDING_HEADER = struct.Struct("<4sBII") # magic, version, seed, frames count
+
+def _write_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+@dataclass
+class InputRecording:
+    """
+    A recorded session. `changes` only lists the frames where the set of held keys changed, along with the new set.
+    """
+    seed: int
+    frames_count: int = 0
+    changes: list[tuple[int, list[int]]] = field(default_factory=list[tuple[int, list[int]]])
+
+    def save(self, path: str):
+        """
+        Save the recording to a file. Each change is stored as the amount of frames since the previous change,
+        followed by the held keys (all as variable-length integers).
+        """
+        data = bytearray(RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, self.seed, self.frames_count))
+        _write_varint(data, len(self.changes))
+        prev_frame = 0
+        for frame, keys in self.changes:
+            _write_varint(data, frame - prev_frame)
+            _write_varint(data, len(keys))
+            for key in keys:
+                _write_varint(data, key)
+            prev_frame = frame
+
+        with open(path, "wb") as recording_file:
+            recording_file.write(data)
+
+    @classmethod
+    def load(cls, path: str) -> "InputRecording":
+        """
+        Load a recording from a file.
+        """
+        with open(path, "rb") as recording_file:
+            data = recording_file.read()
+
+        magic, version, seed, frames_count = RECORDING_HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a Misi Hijau input recording (version {RECORDING_VERSION})")
+
+        recording = cls(seed, frames_count)
+        changes_count, pos = _read_varint(data, RECORDING_HEADER.size)
+        frame = 0
+        for _ in range(changes_count):
+            frame_delta, pos = _read_varint(data, pos)
+            keys_count, pos = _read_varint(data, pos)
+            keys: list[int] = []
+            for _ in range(keys_count):
+                key, pos = _read_varint(data, pos)
+                keys.append(key)
+            frame += frame_delta
+            recording.changes.append((frame, keys))
+        return recording
+
+class InputRecorder:
+    """
+    Records the keys held down on each frame.
+    The key listener passes the keys it polled, so only keys that are bound in the key listener are recorded.
+
+    If `save_path` is set, the recording is also saved there every `AUTOSAVE_INTERVAL` frames, since the game might get closed
+    without Python getting a chance to clean up.
+    """
+    AUTOSAVE_INTERVAL = 300
+
+    def __init__(self, seed: int, save_path: Optional[str] = None):
+        self.recording = InputRecording(seed)
+        self.save_path = save_path
+        self._prev_keys_held: Optional[list[int]] = None
+
+    def record(self, keys_held: list[int]):
+        """
+        Record the current frame. `keys_held` should be sorted.
+        """
+        if keys_held != self._prev_keys_held:
+            self.recording.changes.append((self.recording.frames_count, keys_held))
+            self._prev_keys_held = keys_held
+        self.recording.frames_count += 1
+
+        if self.save_path and self.recording.frames_count % self.AUTOSAVE_INTERVAL == 0:
+            self.save()
+
+    def save(self):
+        """
+        Save the recording to `save_path`.
+        """
+        self.recording.save(self.save_path) if self.save_path else None
+
+class InputReplayer:
+    """
+    Feeds a recording back to the key listener. Has the same `btn` and `btnp` as a backend.
+    Once the recording is over, no key is held down anymore.
+    """
+    def __init__(self, recording: InputRecording):
+        self.recording = recording
+        self.frame = -1
+        self.keys_held: set[int] = set()
+        self._key_press_frame: dict[int, int] = {}
+        self._change_idx = 0
+
+    def next_frame(self):
+        """
+        Move on to the next recorded frame.
+        """
+        self.frame += 1
+        changes = self.recording.changes
+        if self._change_idx < len(changes) and changes[self._change_idx][0] == self.frame:
+            keys_held = changes[self._change_idx][1]
+            for key in keys_held:
+                if key not in self.keys_held:
+                    self._key_press_frame[key] = self.frame
+            self.keys_held = set(keys_held)
+            self._change_idx += 1
+        elif self.frame == self.recording.frames_count:
+            self.keys_held = set()
+
+    def is_finished(self) -> bool:
+        return self.frame >= self.recording.frames_count - 1
+
+    def btn(self, key: int) -> bool:
+        return key in self.keys_held
+
+    def btnp(self, key: int, hold: Optional[int] = None, repeat: Optional[int] = None) -> bool:
+        if key not in self.keys_held:
+            return False
+        return is_key_repeated(self.frame - self._key_press_frame[key], hold, repeat)
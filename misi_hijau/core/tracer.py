@@ -0,0 +1,120 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Event tracing.
+
+While a tracer is attached to the `EventHandler`, every triggered event and every handler it runs is recorded with its
+nesting depth and duration. The trace can be exported in the Chrome `trace_event` format, which can be opened in
+`chrome://tracing` or https://ui.perfetto.dev (events show up as a flame chart, with nested events below the handler that triggered them).
+"""
+
+import json
+from collections import deque
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+# Kinds of trace records
+TRACE_EVENT = 0 # a whole `trigger_event` call
+TRACE_HANDLER = 1 # a single handler function
+
+class EventTracer:
+    """
+    Records event triggers into a ring buffer, so only the last `capacity` records are kept (older ones are dropped).
+    Also counts how many times each event has been triggered during the current frame.
+
+    If `save_path` is set, the trace is also exported there every `AUTOSAVE_INTERVAL` frames, since the game might get closed
+    without Python getting a chance to clean up. (Exporting a full buffer takes a while, so don't autosave too often.)
+    """
+    DEFAULT_CAPACITY = 100000
+    AUTOSAVE_INTERVAL = 900
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, save_path: Optional[str] = None):
+        # (kind, name, handler or None, depth, frame, start, duration)
+        self.records: deque[tuple[int, str, Any, int, int, float, float]] = deque(maxlen=capacity)
+        self.depth = 0 # nesting depth of the event being triggered right now
+        self.frame = 0
+        self.event_counts: dict[str, int] = {} # triggers of each event during the current frame
+        self.last_frame_event_counts: dict[str, int] = {}
+        self.save_path = save_path
+        self._time_start = perf_counter()
+
+    def clear(self):
+        self.records.clear()
+        self.event_counts = {}
+        self.last_frame_event_counts = {}
+
+    def next_frame(self):
+        """
+        Save the event counts of the frame that just ended and start counting a new one.
+        """
+        self.last_frame_event_counts = self.event_counts
+        self.event_counts = {}
+        self.frame += 1
+
+        if self.save_path and self.frame % self.AUTOSAVE_INTERVAL == 0:
+            self.save()
+
+    def trace(self, event_name: str, handlers: tuple[Callable[..., bool | None], ...], args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[bool | None]:
+        """
+        Run the handlers of an event with `args` and `kwargs`, recording the event and each handler. Returns the results of the handlers.
+        """
+        self.event_counts[event_name] = self.event_counts.get(event_name, 0) + 1
+        records = self.records
+        depth = self.depth
+        self.depth += 1
+        results: list[bool | None] = []
+        event_start = perf_counter()
+        try:
+            for handler in handlers:
+                start = perf_counter()
+                results.append(handler(*args, **kwargs))
+                records.append((TRACE_HANDLER, event_name, handler, depth + 1, self.frame, start, perf_counter() - start))
+        finally:
+            self.depth = depth
+            records.append((TRACE_EVENT, event_name, None, depth, self.frame, event_start, perf_counter() - event_start))
+        return results
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        Get the recorded trace as a Chrome `trace_event` object.
+        """
+        trace_events: list[dict[str, Any]] = []
+        for kind, event_name, handler, depth, frame, start, duration in self.records:
+            is_event = kind == TRACE_EVENT
+            trace_events.append({
+                "name": event_name if is_event else getattr(handler, "__qualname__", repr(handler)),
+                "cat": "event" if is_event else "handler",
+                "ph": "X",
+                "ts": (start - self._time_start) * 1e6, # in microseconds
+                "dur": duration * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {"event": event_name, "depth": depth, "frame": frame}
+            })
+        trace_events.sort(key=lambda trace_event: (trace_event["ts"], trace_event["args"]["depth"]))
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str):
+        """
+        Write the recorded trace to a file, in the Chrome `trace_event` JSON format.
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+    def save(self):
+        """
+        Export the recorded trace to `save_path`.
+        """
+        self.export(self.save_path) if self.save_path else None
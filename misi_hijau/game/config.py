@@ -1,4 +1,5 @@
 # All variables listed here will be exported to common.py
 
 WINDOW_WIDTH = 256
-WINDOW_HEIGHT = 256
\ No newline at end of file
+WINDOW_HEIGHT = 256
+FPS = 30
\ No newline at end of file
@@ -19,7 +19,7 @@ Definition for game events.
 import pyxel
 
 from dataclasses import dataclass
-from typing import Callable, Optional, Any
+from typing import Callable, ClassVar, Optional, Any
 
 # XXX
 # This was what I submitted.
@@ -32,6 +32,46 @@ class Event:
     """
     name: str
     data: Optional[dict[str, Any]] = None
+    args: Optional[tuple[Any, ...]] = None # positional arguments, only used by `FrameEvent`
+
+class FrameEvent:
+    """
+    A slotted, reusable event for events that are triggered on every frame (often once per enemy).
+    The data is stored as a tuple of positional arguments in the same order as `fields`, so the handler functions must take their
+    arguments in that same order.
+
+    Instead of instantiating a new event on every trigger, use `reuse` to get the shared instance of the event with new arguments:
+    ```python
+    event_handler.trigger_event(events.FlameUpdate.reuse(x, y, h))
+    ```
+    """
+    __slots__ = ("args",)
+    name: ClassVar[str] = ""
+    fields: ClassVar[tuple[str, ...]] = ()
+    _shared_instance: ClassVar[Optional["FrameEvent"]] = None
+
+    def __init__(self, *args: Any):
+        self.args = args
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._shared_instance = None # every event type gets its own shared instance
+
+    @classmethod
+    def reuse(cls, *args: Any) -> "FrameEvent":
+        """
+        Get the shared instance of this event, with its arguments replaced by `args`.
+        """
+        instance = cls._shared_instance
+        if instance is None:
+            instance = cls._shared_instance = cls(*args)
+        else:
+            instance.args = args
+        return instance
+
+    @property
+    def data(self) -> dict[str, Any]:
+        return dict(zip(self.fields, self.args))
 
 # Events with data being passed
 @dataclass
@@ -43,35 +83,20 @@ class PlayerShootBullets(Event):
         }
     name = "player_shoot_bullets"
 
-class EnemiesBulletsCheck(Event):
+class EnemiesBulletsCheck(FrameEvent):
+    __slots__ = ()
     name = "bullets_check"
-    def __init__(self, enemy_x: float, enemy_y: float, enemy_w: float, enemy_h: int):
-        self.data = {
-            "enemy_x_map": enemy_x,
-            "enemy_y_map": enemy_y,
-            "enemy_w": enemy_w,
-            "enemy_h": enemy_h
-        }
+    fields = ("enemy_x_map", "enemy_y_map", "enemy_w", "enemy_h")
 
-class PlayerBulletsCheck(Event):
+class PlayerBulletsCheck(FrameEvent):
+    __slots__ = ()
     name = "player_bullets_check"
-    def __init__(self, x_player: float, y_player: float, w_player: int, h_player: int):
-        self.data = {
-            "x_player": x_player,
-            "y_player": y_player,
-            "w_player": w_player,
-            "h_player": h_player
-        }
+    fields = ("x_player", "y_player", "w_player", "h_player")
 
-class PlayerCollidingEnemy(Event):
+class PlayerCollidingEnemy(FrameEvent):
+    __slots__ = ()
     name = "is_player_colliding_enemy"
-    def __init__(self, enemy_x: float, enemy_y: float, enemy_w: float, enemy_h: int):
-        self.data = {
-            "enemy_x": enemy_x,
-            "enemy_y": enemy_y,
-            "enemy_w": enemy_w,
-            "enemy_h": enemy_h
-        }
+    fields = ("enemy_x", "enemy_y", "enemy_w", "enemy_h")
 
 class DecreasePlayerHealth(Event):
     name = "decrease_player_health"
@@ -106,23 +131,15 @@ class AppendBlastEffect(Event):
             "object_h": object_h
         }
 
-class FlameUpdate(Event):
+class FlameUpdate(FrameEvent):
+    __slots__ = ()
     name = "flame_update"
-    def __init__(self, x: float, y: float, h: int):
-        self.data = {
-            "player_x": x,
-            "player_y": y,
-            "player_h": h
-        }
+    fields = ("player_x", "player_y", "player_h")
         
-class TilemapPlayerCheck(Event):
+class TilemapPlayerCheck(FrameEvent):
+    __slots__ = ()
     name = "tilemap_player_check"
-    def __init__(self, uv: tuple[int, int], tile_x: int, tile_y: int):
-        self.data = {
-            "uv": uv,
-            "tile_x": tile_x,
-            "tile_y": tile_y
-        }
+    fields = ("uv", "tile_x", "tile_y")
 
 class BroadcastEnemiesCount(Event):
     name = "broadcast_enemies_count"
@@ -131,15 +148,10 @@ class BroadcastEnemiesCount(Event):
             "count": count
         }
 
-class SquidgeNearPlayer(Event):
+class SquidgeNearPlayer(FrameEvent):
+    __slots__ = ()
     name = "send_coord_to_squidge"
-    def __init__(self, x_enemy: float, y_enemy: float, w_enemy: int, h_enemy: int):
-        self.data = {
-            "x_enemy": x_enemy,
-            "y_enemy": y_enemy,
-            "w_enemy": w_enemy,
-            "h_enemy": h_enemy
-        }
+    fields = ("x_enemy", "y_enemy", "w_enemy", "h_enemy")
 
 class SquidgeShootBullet(Event):
     name = "squidge_shoot_bullet"
@@ -224,7 +236,6 @@ class ShowDialog(Event):
 TextengineInterrupt = Event("text_engine_interrupt") # stop currently running text engine
 CheckLevelComplete = Event("check_level_complete") # check whether or not level has been completed
 UpdateHealthbar = Event("update_healthbar")
-UpdateStatusbar = Event("update_statusbar")
 SlideshowNext = Event("slideshow_next") # next game intro slide
 ShowInstructions = Event("show_instruction") # show game instruction
 StarsScroll = Event("stars_scroll")
@@ -236,4 +247,5 @@ ShowLevelStats = Event("show_level_stats") # show level stats (after finishing a
 StopGameLoop = Event("stop_game_loop") # change the game's draw call to UI components-only draw loop
 ResumeGameLoop = Event("resume_game_loop") # change the game's update and draw call to the actual game loop
 FinishGame = Event("finish_game")
+QuitGame = Event("quit_game") # the game is about to quit (save anything that needs saving)
 ShowLevelDialog = Event("show_level_dialog")
\ No newline at end of file
@@ -18,28 +18,38 @@ Game loop handler.
 
 import pyxel
 
+from typing import Any, Optional
+
 from . import events
 
 from core import components
+from core.common import Clock, WALL_CLOCK, KeyFunc, KeyType
+from core import backend
+from core.profiler import FrameProfiler
 from core.game_handler import GameComponents, GameHandler
 
-from res.sprites import SpritesFactory
 from res.ui import UIComponentFactory
 from res.levels import levels, LEVELS_COUNT
+from res.resources_load import resources, RESOURCE_IMAGES, RESOURCE_TILEMAPS
 
 from game.storyline.intro import IntroPlayer
-from game.storyline.outro import OutroPlayer
 from game.storyline.story_dialogs import InGameStoryline
 
+# The sprites and the outro are imported when they're first needed (on game start and at the end), to speed up startup
+
 class Game():
+    PROFILER_TOGGLE_KEY = pyxel.KEY_F3
+
     ##################
     # Initialization #
     ##################
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
         """
-        Game initialization.
+        Game initialization. The `clock` is used by the game timer; it defaults to the wall clock.
+        Pass a `FrameClock` to get the same timings no matter how fast the game is ticked.
         """
+        self.clock = clock if clock else WALL_CLOCK
         game_components = self.init_game_components()
 
         self.init_game_handler(game_components) # set up game handler
@@ -47,6 +57,7 @@ class Game():
         self._init_event_handlers() # add event handlers
         self.ui_stars = None # stars are separated from the other UI components so it can be drawn first
         self.init_ui() # initialize UI components directly
+        self._init_profiler() # frame profiler (disabled until toggled)
         self._start_intro_slideshow() # start intro
         self._init_story_dialog() # instantiate ingame storyline
         
@@ -59,13 +70,38 @@ class Game():
         self.intro_player.slide_intro()
     
     def _start_outro_slide(self):
+        from game.storyline.outro import OutroPlayer
         self.outro_player = OutroPlayer(self.game_handler)
     
     def _init_story_dialog(self):
         self.story_dialog = InGameStoryline(self.game_handler)
 
+    def _init_profiler(self):
+        self.profiler = FrameProfiler(self._get_profiler_targets)
+        self.game_handler.game_components.keylistener.add("toggle_profiler", KeyFunc([self.PROFILER_TOGGLE_KEY], self.profiler.toggle, KeyType.BTNP))
+
+    def _get_profiler_targets(self) -> list[tuple[str, Any, str]]:
+        game_components = self.game_handler.game_components
+        targets: list[tuple[str, Any, str]] = [
+            ("update", self.game_handler, "update"),
+            ("core update", self.game_handler, "_core_update_loop"),
+            ("draw", self.game_handler, "draw"),
+            ("camera draw", game_components.camera, "draw"),
+            ("hud draw", self.hud_layer, "draw"),
+        ]
+        targets.append(("stars draw", self.ui_stars, "draw")) if self.ui_stars else None
+
+        for sprite in game_components.game_sprites.sprites_handler:
+            sprite_name = type(sprite).__name__
+            targets.append((f"{sprite_name} update", sprite, "update"))
+            targets.append((f"{sprite_name} draw", sprite, "draw"))
+
+        for component in game_components.game_ui.ui_components.values():
+            targets.append((f"{type(component).__name__} draw", component, "draw"))
+
+        return targets
+
     def _init_event_handlers(self):
-        self.game_handler.game_components.event_handler.add_handler(events.UpdateStatusbar.name, self.update_statusbar)
         self.game_handler.game_components.event_handler.add_handler(events.LevelRestart.name, self.level_restart)
         self.game_handler.game_components.event_handler.add_handler(events.LevelNext.name, self.increment_level)
         self.game_handler.game_components.event_handler.add_handler(events.StartGame.name, self.start_game)
@@ -81,11 +117,13 @@ class Game():
         keylistener = components.KeyListener()
         statusbar = components.GameStatusbar()
         game_sprites = components.GameSprites()
-        event_handler = components.EventHandler()
+        event_handler = components.EventHandler(compiled_dispatch=True)
         ui_handler = components.GameUI()
         ticker = components.TickerHandler()
-        timer = components.Timer()
-        game_components = GameComponents(soundplayer, camera, keylistener, statusbar, game_sprites, ui_handler, event_handler, ticker, timer)
+        timer = components.Timer(self.clock)
+        tile_index = components.TileIndex()
+        tile_watchlist = components.TileWatchlist()
+        game_components = GameComponents(soundplayer, camera, keylistener, statusbar, game_sprites, ui_handler, event_handler, ticker, timer, tile_index, tile_watchlist)
         return game_components
         
     def init_game_handler(self, game_components: GameComponents):
@@ -117,7 +155,7 @@ class Game():
         Game scene draw loop.
         """
         # Draw the black background to prevent ghosting effect
-        pyxel.cls(pyxel.COLOR_BLACK)
+        backend.get().cls(pyxel.COLOR_BLACK)
 
         # Draw the stars.
         self.ui_stars.draw() if self.ui_stars else None
@@ -128,17 +166,18 @@ class Game():
         # Sprites
         self.game_handler.game_components.game_sprites.draw()
 
+        # HUD (statusbar and healthbar), below the other UI components so dialogs and hints stay on top
+        self.hud_layer.draw()
+
         # Game UI components
         self.game_handler.game_components.game_ui.draw()
-
-        # Statusbar
-        self.game_handler.game_components.statusbar.draw()
     
     #####################
     # Enitity creations #
     #####################
 
     def init_sprites(self):
+        from res.sprites import SpritesFactory
         self.sprites_factory = SpritesFactory(self.game_handler)
         sprites_handler = self.game_handler.game_components.game_sprites
         sprites_handler.append_sprites_handler(self.sprites_factory.create_sprite_handlers())
@@ -146,7 +185,6 @@ class Game():
         sprites_handler.append_raw_sprites(self.sprites_factory.create_raw_sprites())
         self.assign_keybindings_to_sprites()
         self.append_sprites_statusbar()
-        self.game_handler.game_components.statusbar.update()
 
     def assign_keybindings_to_sprites(self):
         keybinds = self.game_handler.game_components.game_sprites.get_keybinds()
@@ -162,25 +200,29 @@ class Game():
         game_ui_handler.append(self.ui_factory.create_ui_components())
         self.ui_stars = self.ui_factory.create_stars()
 
+        # The statusbar and healthbar are drawn on the HUD layer
+        statusbar = self.game_handler.game_components.statusbar
+        healthbar = game_ui_handler.ui_components["healthbar"]
+        self.hud_layer = components.HudLayer()
+        self.hud_layer.attach(statusbar.update, statusbar.draw)
+        self.hud_layer.attach(healthbar.update, healthbar.draw)
+
     ##################
     # Event handlers #
     ##################
 
-    def update_statusbar(self):
-        self.game_handler.game_components.statusbar.update()
-    
     def level_restart(self):
         self.game_handler.callable_draw = self.game_loop_draw
 
         self.game_handler.game_components.game_sprites.restart_level()
         self.game_handler.game_components.game_ui.restart_level()
-        self.game_handler.game_components.statusbar.update() # make sure the new item values show up
+        self.game_handler.game_components.statusbar.invalidate() # make sure the new item values show up
 
     def setup_next_level(self):
         self.game_handler.set_callable_draw(self.game_loop_draw)
         self.game_handler.game_components.game_sprites.init_level()
         self.game_handler.game_components.game_ui.init_level()
-        self.game_handler.game_components.statusbar.update() # make sure the new item values show up
+        self.game_handler.game_components.statusbar.invalidate() # make sure the new item values show up
     
     def increment_level(self):
         curr_level = self.game_handler.levelhandler.get_curr_lvl_idx()
@@ -197,6 +239,7 @@ class Game():
         self.setup_next_level()
 
     def start_game(self):
+        resources.require(RESOURCE_IMAGES, RESOURCE_TILEMAPS)
         self.init_sprites()
         self.game_handler.callable_draw = self.game_loop_draw
         self.game_handler.callable_update = self.game_loop_update
@@ -218,6 +261,7 @@ class Game():
         Call the game_handler.callable_draw method.
         """
         self.game_handler.draw()
+        self.profiler.draw() if self.profiler.enabled else None
 
     def update(self):
         """
@@ -15,6 +15,7 @@
 import pyxel
 
 from core.game_handler import GameHandler
+from core import backend
 from core.common import TickerItem
 from core.game_ui_classes import UIComponent
 from game import events
@@ -49,6 +50,8 @@ class BlinkingTextHint(UIComponent):
         self.img = background_img_idx
         self.coord.x = x
         self.coord.y = y
+        if self.hint_text_blink_ticker:
+            self.game_handler.game_components.ticker.detach(self.hint_text_blink_ticker) # the previous ticker isn't needed anymore
         self.hint_text_blink_ticker = self.game_handler.game_components.ticker.attach(30)
         self.msg = msg
         self.text_color = text_color
@@ -70,14 +73,14 @@ class BlinkingTextHint(UIComponent):
 
     def _draw_text_with_stacking(self):
         if self.hint_text_blink_idx:
-            pyxel.text(self.coord.x, self.coord.y, self.msg, self.text_color)
+            backend.get().text(self.coord.x, self.coord.y, self.msg, self.text_color)
         else: 
             # blit back of the text with the background image instead of constantly drawing everything (computationally cheaper)
-            pyxel.blt(self.coord.x, self.coord.y, self.img, self.coord.x, self.coord.y, self.msg_width, pyxel.FONT_HEIGHT)
+            backend.get().blt(self.coord.x, self.coord.y, self.img, self.coord.x, self.coord.y, self.msg_width, pyxel.FONT_HEIGHT)
     
     def _draw_text_constantly(self):
         if self.hint_text_blink_idx:
-            pyxel.text(self.coord.x, self.coord.y, self.msg, self.text_color)
+            backend.get().text(self.coord.x, self.coord.y, self.msg, self.text_color)
 
     def init_level(self):
         self.active = False
@@ -18,6 +18,7 @@ from typing import Optional, Callable, Any
 
 from core.common import KeyFunc, WINDOW_WIDTH, WINDOW_HEIGHT, Sfx, SoundType
 from core.game_handler import GameHandler
+from core import backend
 from core.game_ui_classes import UIComponent, UIComponentCoordinate
 from .. import events
 
@@ -79,7 +80,7 @@ class Dialog(UIComponent):
         Note: you must pass `dismiss_msg_str` argument if `show_dismiss_msg` is enabled or else, the message will show as UNDEFINED.
         """
         
-        self.tmp_keyfunc.binding = [key_dismiss]
+        self.game_handler.game_components.keylistener.rebind("dialog_dismiss_btn", [key_dismiss])
         self.function_when_done = function_when_done
         self.text_gap = text_gap
         self.bg_color = bg_color
@@ -124,7 +125,7 @@ class Dialog(UIComponent):
         self.coord.y = (WINDOW_HEIGHT - self.h) // 2
 
     def _draw(self):
-        pyxel.rect(self.coord.x, self.coord.y, self.w, self.h, self.bg_color)
+        backend.get().rect(self.coord.x, self.coord.y, self.w, self.h, self.bg_color)
         self._draw_text()
     
     def _alter_keyfunc_state(self, state: bool):
@@ -136,10 +137,10 @@ class Dialog(UIComponent):
         base_x = self.coord.x + (self.w - self.message_len*pyxel.FONT_WIDTH) // 2
         base_y = self.coord.y + self.text_gap
 
-        pyxel.text(base_x, base_y, self.message, self.text_color)
+        backend.get().text(base_x, base_y, self.message, self.text_color)
 
         if self.show_dismiss_msg:
-            pyxel.text(self.coord.x + self.DISMISS_MSG_GAP, self.coord.y + self.h - pyxel.FONT_HEIGHT - self.DISMISS_MSG_GAP, self.dismiss_msg_str, self.dismiss_msg_col)
+            backend.get().text(self.coord.x + self.DISMISS_MSG_GAP, self.coord.y + self.h - pyxel.FONT_HEIGHT - self.DISMISS_MSG_GAP, self.dismiss_msg_str, self.dismiss_msg_col)
         
     def _wrap_string(self, string: str) -> str:
         """
@@ -19,6 +19,7 @@ from core.common import (
 )
 from core.utils import tile_to_real
 from core.game_handler import GameHandler
+from core import backend
 from core.game_ui_classes import UIComponent, UIComponentCoordinate
 from .. import events
 
@@ -32,6 +33,7 @@ class HealthBar(UIComponent):
     def_gap_x = 1
     edge_gap = 4
     coord = UIComponentCoordinate(0, 0)
+    on_hud_layer = True
 
     def __init__(self, game_handler: GameHandler):
         self.game_handler = game_handler
@@ -48,24 +50,35 @@ class HealthBar(UIComponent):
     def setup(self):
         self.health_count = self.game_handler.levelhandler.get_curr_lvl().max_health
         self._recalculate()
+        self.dirty = True
 
     def _draw(self):
         if self.health_count > 0:
             x_prev = self.coord.x
             for _ in range(0, self.health_count):
                 x = x_prev + self.w + self.def_gap_x
-                pyxel.blt(x, self.coord.y, 0, self.costume[0], self.costume[1], self.w, self.h, ALPHA_COL)
+                backend.get().blt(x, self.coord.y, 0, self.costume[0], self.costume[1], self.w, self.h, ALPHA_COL)
                 x_prev = x
 
     def change_health_count(self, change_value: int):
         self.health_count += change_value
         self._recalculate
+        self.dirty = True
+
+    def update(self) -> bool:
+        """
+        Returns `True` if the healthbar has changed since the last call.
+        """
+        changed = self.dirty
+        self.dirty = False
+        return changed
 
     def _recalculate(self):
         self.coord.x = WINDOW_WIDTH - pyxel.TILE_SIZE - self.health_count * self.def_gap_x - tile_to_real(self.health_count) - self.edge_gap
         self.coord.y = self.def_gap_x + self.edge_gap
 
     def _alter_healthbar_visibility(self, state: bool):
+        self.dirty = self.dirty or state != self.active
         self.active = state
 
     def init_level(self):
@@ -13,24 +13,42 @@
 # limitations under the License.
 
 from dataclasses import dataclass
+from typing import Any
 import pyxel
 from core.common import (
     WINDOW_HEIGHT,
     WINDOW_WIDTH,
 )
 from core.game_handler import GameHandler
+from core import backend
 from .. import events
 
 @dataclass
 class Stars: # kinda a UI component but is drawn before everything else so the component rules don't apply to this class
     """
     Stars that scrolls in the background.
+
+    Stars are grouped into speed bands. Each band is drawn once to its own offscreen strip (the size of the window)
+    when the stars are generated, so scrolling only moves the band's offset and drawing is two wrap-around blits per band,
+    no matter how many stars there are.
     """
+    STARS_MIN_SPEED = 1
+    STARS_MAX_SPEED = 5
+    STARS_BANDS_COUNT = 4
+
     def __init__(self, num_stars: int, game_handler: GameHandler):
         self.num_stars = num_stars
         game_handler.game_components.event_handler.add_handler(events.StarsScroll.name, self.update)
         self.camera = game_handler.game_components.camera
+        band_width = (self.STARS_MAX_SPEED - self.STARS_MIN_SPEED) / self.STARS_BANDS_COUNT
+        self.bands_speed = [self.STARS_MIN_SPEED + band_width * (band + 0.5) for band in range(self.STARS_BANDS_COUNT)] # each band moves at its middle speed
+        self.setup()
+
+    def setup(self):
         self.stars_list = self.generate_stars_list(self.num_stars)
+        self.bands_strip = self.render_bands_strip(self.stars_list)
+        self.bands_offset = [0.0] * self.STARS_BANDS_COUNT
+        self.last_update_frame = -1
 
     def generate_stars_list(self, num_stars: int) -> list[tuple[float, float, float]]:
         stars_list: list[tuple[float, float, float]] = []
@@ -42,22 +60,41 @@ class Stars: # kinda a UI component but is drawn before everything else so the c
             ))
         
         return stars_list
+
+    def _get_band(self, speed: float) -> int:
+        band = int((speed - self.STARS_MIN_SPEED) * self.STARS_BANDS_COUNT / (self.STARS_MAX_SPEED - self.STARS_MIN_SPEED))
+        return min(max(band, 0), self.STARS_BANDS_COUNT - 1)
+
+    def render_bands_strip(self, stars_list: list[tuple[float, float, float]]) -> list[Any]:
+        """
+        Draw the stars of each speed band to an offscreen image.
+        """
+        gfx = backend.get()
+        bands_strip = [gfx.create_image(WINDOW_WIDTH, WINDOW_HEIGHT) for _ in range(self.STARS_BANDS_COUNT)]
+        for x, y, speed in stars_list:
+            gfx.image_pset(bands_strip[self._get_band(speed)], int(x), int(y) % WINDOW_HEIGHT, pyxel.COLOR_CYAN if speed < 3 else pyxel.COLOR_NAVY)
+        return bands_strip
         
     def update(self):
-        for i, (x, y, speed) in enumerate(self.stars_list):
-            y += (self.camera.dir_y / (8 + speed)) * -1
-            if y >= WINDOW_HEIGHT:
-                y -= WINDOW_HEIGHT
-            if y <= 0:
-                y = WINDOW_HEIGHT
-            self.stars_list[i] = (x, y, speed)
+        # The scroll event might be triggered more than once a frame (once for each axis the player moves in)
+        frame_count = backend.get().frame_count
+        if frame_count == self.last_update_frame:
+            return
+        self.last_update_frame = frame_count
+
+        dir_y = self.camera.dir_y
+        self.bands_offset = [(offset - dir_y / (8 + speed)) % WINDOW_HEIGHT for offset, speed in zip(self.bands_offset, self.bands_speed)]
 
     def draw(self):
-        for x, y, speed in self.stars_list:
-            pyxel.pset(x, y, pyxel.COLOR_CYAN if speed < 3 else pyxel.COLOR_NAVY)
+        gfx = backend.get()
+        for strip, offset in zip(self.bands_strip, self.bands_offset):
+            offset = int(offset)
+            # The strip is wrapped around: the part pushed off the bottom edge is drawn at the top.
+            gfx.blt(0, offset, strip, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - offset, pyxel.COLOR_BLACK)
+            gfx.blt(0, 0, strip, 0, WINDOW_HEIGHT - offset, WINDOW_WIDTH, offset, pyxel.COLOR_BLACK) if offset > 0 else None
     
     def init_level(self):
-        self.stars_list = self.generate_stars_list(self.num_stars)
+        self.setup()
 
     def restart_level(self):
-        pass
\ No newline at end of file
+        pass
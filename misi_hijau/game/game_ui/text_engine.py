@@ -15,6 +15,7 @@
 from typing import Callable, Optional
 import pyxel
 from core.game_handler import GameHandler
+from core import backend
 from core.common import WINDOW_WIDTH, Sfx, SoundType
 from core.game_ui_classes import UIComponent
 from .. import events
@@ -105,7 +106,7 @@ class TextEngine(UIComponent):
         self.string_pos = 0
     
     def _draw(self):
-        pyxel.text(self.x + self.padding, self.y + self.padding, self.current_string[:self.string_pos], self.current_color)
+        backend.get().text(self.x + self.padding, self.y + self.padding, self.current_string[:self.string_pos], self.current_color)
     
     def _interrupt_handler(self):
         self.soundplayer.stop_sfx_channel_playback(self.typing_sfx)
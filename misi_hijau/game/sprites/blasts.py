@@ -13,14 +13,12 @@
 # limitations under the License.
 
 # Imports
-import pyxel
-
 import game.events as events
 
-from core.sprite_classes import Sprite, SpriteHandler
+from core.sprite_classes import Sprite, SpriteCoordinate, SpriteHandler
 from core.game_handler import GameHandler
-from core.components import TickerHandler
-from core.common import ALPHA_COL
+from core import backend
+from core.common import ALPHA_COL, EntityPool, TickerItem
 
 class Blast(Sprite):
     w = 16
@@ -32,47 +30,64 @@ class Blast(Sprite):
         "blast_3": (0, 80)
     }
 
-    def __init__(self, ticker: TickerHandler, x: float, y: float):
-        self.blast_stage: int = 1
+    def __init__(self):
+        # Blasts are pooled, so they're only created once and then reused with `spawn`.
+        # The ticker isn't attached to the ticker handler; the blasts handler ticks it while the blast is live.
+        self.coord = SpriteCoordinate(-20, -20, -20, -20)
+        self.ticker = TickerItem(5)
+        self.blast_stage: int = 0
+
+    def spawn(self, x: float, y: float):
+        self.blast_stage = 1
         self.set_costume(self.costumes["blast_1"])
         self.coord.x_map = x
         self.coord.y_map = y
-        self.ticker = ticker.attach(5)
+        self.ticker.reset()
     
     def update(self):
+        self.ticker.tick()
         if self.ticker.get():
             self.blast_stage += 1
         self.costume_change()
 
     def draw(self):
-        pyxel.blt(self.coord.x, self.coord.y, 0, self.u, self.v, self.w, self.h, ALPHA_COL)
+        backend.get().blt(self.coord.x, self.coord.y, 0, self.u, self.v, self.w, self.h, ALPHA_COL)
     
     def costume_change(self):
         self.set_costume(self.costumes["blast_2"]) if self.blast_stage == 3 else None
         self.set_costume(self.costumes["blast_3"]) if self.blast_stage == 4 else None
 
 class BlastsHandler(SpriteHandler):
+    BLASTS_CAPACITY = 32 # new blasts are skipped when this many are already on screen
+
     def __init__(self, game_handler: GameHandler):
         self.game_components = game_handler.game_components
         self.game_components.event_handler.add_handler(events.AppendBlastEffect.name, self.append_blast)
-        self.blasts: list[Blast] = []
+        self.blasts: EntityPool[Blast] = EntityPool(self.BLASTS_CAPACITY, Blast)
     
     def draw(self):
-        for blast in self.blasts:
-            blast.draw()
+        blasts = self.blasts.entities
+        for slot in self.blasts.active_slots:
+            blasts[slot].draw()
 
     def update(self):
-        for blast in self.blasts:
+        blasts = self.blasts.entities
+        active_slots = self.blasts.active_slots
+        # backwards, because releasing a blast moves the last one into its place
+        for i in range(len(active_slots) - 1, -1, -1):
+            slot = active_slots[i]
+            blast = blasts[slot]
             blast.update()
             blast.map_to_view(self.game_components.camera.y)
             if blast.blast_stage == 5:
-                self.blasts.remove(blast)
+                self.blasts.release(slot)
 
     def append_blast(self, x: float, y: float, object_w: int, object_h: int):
-        self.blasts.append(Blast(self.game_components.ticker, x - object_w // 2, y - object_h // 2))
+        slot = self.blasts.acquire()
+        self.blasts.entities[slot].spawn(x - object_w // 2, y - object_h // 2) if slot >= 0 else None
     
     def restart_level(self):
-        self.blasts = []
+        self.blasts.clear()
     
     def init_level(self):
-        self.blasts = []
\ No newline at end of file
+        self.blasts.clear()
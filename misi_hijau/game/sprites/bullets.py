@@ -14,35 +14,141 @@
 
 import pyxel
 
-from core.common import Sfx, SoundType, WINDOW_HEIGHT
-from core.sprite_classes import Sprite, SpriteCoordinate, SpriteHandler
+from core.common import Sfx, SoundType, SpatialHash, EntityPool, WINDOW_HEIGHT, WINDOW_WIDTH
+from core.sprite_classes import SpriteHandler
 from core.game_handler import GameHandler
+from core import backend
 from core.utils import tile_to_real
 from game import events
 
-class Bullet(Sprite):
-
-    def __init__(self, coord: SpriteCoordinate, color: int, y_speed: float = 3, x_speed: float = 0, width: int = 2, height: int = 8, from_enemy: bool = False):
-        self.coord = coord
-        self.color = color
-        self.is_dead = False
-        self.y_speed = y_speed
-        self.x_speed = x_speed
-        self.from_enemy = from_enemy
-        self.w = width
-        self.h = height
-    
-    def update(self):
-        self.coord.y_map -= self.y_speed
-        self.coord.x_map -= self.x_speed
+class BulletStore:
+    """
+    Bullets stored as a struct of arrays: each bullet attribute has its own column, and a bullet is just a row index.
+    Moving the bullets, culling the ones that went out of the level and the viewport transform are done together in a single pass
+    over the live rows, once per frame. (Whole-column passes with `map` measured slower than this one fused loop, since each column
+    then has to be walked several times.)
+
+    The columns are allocated once for `capacity` bullets and the rows are handed out by an `EntityPool`, so shooting doesn't
+    allocate anything. A bullet keeps its row until it's removed. The pool doesn't keep the rows in shot order, so every bullet
+    also gets a shot number (`shot_seq`), which `get_rows` sorts by.
+    """
+    def __init__(self, capacity: int):
+        self.pool: EntityPool[None] = EntityPool(capacity)
+        self.x_map: list[float] = [0] * capacity # x coord (relative to the map, also the viewport x since we only scroll in y direction)
+        self.y_map: list[float] = [0] * capacity # y coord (relative to the map)
+        self.y: list[float] = [0] * capacity # y coord (viewport)
+        self.x_speed: list[float] = [0] * capacity
+        self.y_speed: list[float] = [0] * capacity
+        self.w: list[int] = [0] * capacity
+        self.h: list[int] = [0] * capacity
+        self.color: list[int] = [0] * capacity
+        self.from_enemy: list[bool] = [False] * capacity
+        self.shot_seq: list[int] = [0] * capacity # increases with every shot bullet
+        self._shot_counter = 0
+
+    def clear(self):
+        """
+        Remove every bullet.
+        """
+        self.pool.clear()
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def append(self, x_map: float, y_map: float, cam_y: float, color: int, y_speed: float, x_speed: float, w: int, h: int, from_enemy: bool) -> int:
+        """
+        Add a bullet and return its row, or -1 if the store is full (the bullet is dropped then).
+        """
+        row = self.pool.acquire()
+        if row < 0:
+            return row
+        self.x_map[row] = x_map
+        self.y_map[row] = y_map
+        self.y[row] = y_map - cam_y + WINDOW_HEIGHT / 2
+        self.x_speed[row] = x_speed
+        self.y_speed[row] = y_speed
+        self.w[row] = w
+        self.h[row] = h
+        self.color[row] = color
+        self.from_enemy[row] = from_enemy
+        self.shot_seq[row] = self._shot_counter
+        self._shot_counter += 1
+        return row
+
+    def kill(self, row: int):
+        """
+        Remove a bullet.
+        """
+        self.pool.release(row)
+
+    def is_alive(self, row: int) -> bool:
+        return self.pool.is_active(row)
+
+    def get_rows(self, from_enemy: bool) -> list[int]:
+        """
+        Get the rows of bullets that are still alive, shot either by the enemies or by the player, in the order they were shot.
+        """
+        bullets_from_enemy = self.from_enemy
+        rows = [row for row in self.pool.active_slots if bullets_from_enemy[row] == from_enemy]
+        rows.sort(key=self.shot_seq.__getitem__) # mostly sorted already (only removals shuffle the rows), so this is cheap
+        return rows
+
+    def is_colliding(self, row: int, x: float, y: float, w: float, h: float) -> bool:
+        """
+        Same as `Sprite.is_colliding`, for the bullet at `row`.
+        """
+        bullet_x = self.x_map[row]
+        bullet_y = self.y[row]
+        return (
+            bullet_x + self.w[row] > x
+                and x + w > bullet_x
+                and bullet_y + self.h[row] > y
+                and y + h > bullet_y
+        )
+
+    def update(self, cam_y: float, level_width: float, level_height: float):
+        """
+        Move every bullet, remove the ones outside of the level, then calculate the viewport coordinates.
+        """
+        x_map, y_map, view_y = self.x_map, self.y_map, self.y
+        x_speed, y_speed = self.x_speed, self.y_speed
+        view_y_offset = WINDOW_HEIGHT / 2 - cam_y
+        active_rows = self.pool.active_slots
+
+        # backwards, because removing a bullet moves the last row into its place
+        for i in range(len(active_rows) - 1, -1, -1):
+            row = active_rows[i]
+            x = x_map[row] - x_speed[row]
+            y = y_map[row] - y_speed[row]
+            if 0 <= x <= level_width and 0 <= y <= level_height:
+                x_map[row] = x
+                y_map[row] = y
+                view_y[row] = y + view_y_offset
+            else:
+                self.pool.release(row)
 
     def draw(self):
-        if self.is_sprite_in_viewport():
-            pyxel.rect(self.coord.x, self.coord.y, self.w, self.h, self.color)
-    
+        gfx = backend.get()
+        x_map, view_y, w, h, color = self.x_map, self.y, self.w, self.h, self.color
+        for row in self.pool.active_slots:
+            x = x_map[row]
+            y = view_y[row]
+            bullet_h = h[row]
+            # same as `Sprite.is_sprite_in_viewport`
+            if not (x < -bullet_h or x > WINDOW_WIDTH + bullet_h or y < -bullet_h or y > WINDOW_HEIGHT + bullet_h):
+                gfx.rect(x, y, w[row], bullet_h, color[row])
+
 class BulletsHandler(SpriteHandler):
+    BULLETS_GRID_CELL_SIZE = 16
+    BULLETS_CAPACITY = 2048 # way more than normal gameplay needs (the bullet spray benchmark goes up to ~1500)
+
     def __init__(self, game_handler: GameHandler):
-        self.bullets: list[Bullet] = []
+        self.bullets = BulletStore(self.BULLETS_CAPACITY)
+
+        # Player bullets are put in a grid (keyed on map coordinates) so each enemy only needs to check the bullets around it.
+        # The grid is rebuilt lazily, at most once per frame, when the bullets have moved.
+        self.player_bullets_grid = SpatialHash(self.BULLETS_GRID_CELL_SIZE)
+        self._player_bullets_grid_dirty = True
         self.game_handler = game_handler
         self.game_handler.game_components.event_handler.add_handler(events.PlayerShootBullets.name, self.player_shoot_handler)
         self.game_handler.game_components.event_handler.add_handler(events.SquidgeShootBullet.name, self.squidge_shoot_handler)
@@ -60,42 +166,36 @@ class BulletsHandler(SpriteHandler):
         self.bullet_color = level.bullet_color
 
     def append_bullet(self, x: float, y: float, color: int, y_speed: float = 3, x_speed: float = 0, width: int = 2, height: int = 8, from_enemy: bool = False):
-        bullet = Bullet(SpriteCoordinate(-30, -30, x, y), color, y_speed, x_speed, width, height, from_enemy)
-        bullet.map_to_view(self.game_handler.game_components.camera.y)
-        self.bullets.append(bullet)
+        self.bullets.append(x, y, self.game_handler.game_components.camera.y, color, y_speed, x_speed, width, height, from_enemy)
+        self._player_bullets_grid_dirty = True
 
     def update(self):
         if len(self.bullets) <= 0:
             return
-        
-        for bullet in self.bullets:
-            bullet.update()
-            bullet.map_to_view(self.game_handler.game_components.camera.y)
-
-            # XXX at this point I just realized that I can 
-            # make an if_touching_level_edge method for the Sprite class
-            if (
-                bullet.coord.y_map > self.level_height
-                    or bullet.coord.y_map < 0
-                    or bullet.coord.x_map > self.level_width
-                    or bullet.coord.x_map < 0
-            ):
-                self.bullets.remove(bullet)
-
-            bullet.map_to_view(self.game_handler.game_components.camera.y)
+
+        self.bullets.update(self.game_handler.game_components.camera.y, self.level_width, self.level_height)
+        self._player_bullets_grid_dirty = True
+
+    def _rebuild_player_bullets_grid(self):
+        # The grid holds bullet rows. A removed row can get reused by a new bullet, but adding a bullet marks the grid as dirty.
+        # The rows are inserted in shot order, so queries give the oldest bullet first (it's the one that hits).
+        self.player_bullets_grid.clear()
+        bullets = self.bullets
+        for row in bullets.get_rows(from_enemy=False):
+            self.player_bullets_grid.insert(row, bullets.x_map[row], bullets.y_map[row], bullets.w[row], bullets.h[row])
+        self._player_bullets_grid_dirty = False
 
     def draw(self):
         if len(self.bullets) <= 0:
             return
         
-        for bullet in self.bullets:
-            bullet.draw()
+        self.bullets.draw()
     
     def player_shoot_handler(self, player_x: float, player_y: float):
         self.append_bullet(player_x + 7, player_y - 8, self.bullet_color, 3) # FIXME or maybe not, idk too lazy: add w and h as parameter
     
     def squidge_shoot_handler(self, x_enemy: float, y_enemy: float, x_player: float, y_player: float):
-        if len([bullet for bullet in self.bullets if bullet.from_enemy]) > 5:
+        if len(self.bullets.get_rows(from_enemy=True)) > 5:
             return
 
         # credit: chatgpt because I'm a not-so-special 8th grader :sunglasses:
@@ -110,38 +210,38 @@ class BulletsHandler(SpriteHandler):
     # FIXME: DOUBLE FOR LOOPS. IDC, IT'S 8 PM AND I NEED TO FINISH THIS OFF ^_^
     # FIXME: also very inconsistent name, thank you
     def bullets_colliding_player_check_handler(self, x_player: float, y_player: float, w_player: int, h_player: int):
-        for bullet in self.bullets:
-            if not bullet.from_enemy:
-                continue
-
-            if bullet.is_colliding(x_player, y_player, w_player, h_player):
+        for row in self.bullets.get_rows(from_enemy=True):
+            if self.bullets.is_colliding(row, x_player, y_player, w_player, h_player):
                 if self.game_handler.game_components.event_handler.trigger_event(events.DecreasePlayerHealth(-1)):
-                    self.bullets.remove(bullet) if bullet in self.bullets else None
+                    self.bullets.kill(row)
 
     def bullets_colliding_enemy_check_handler(self, enemy_x_map: float, enemy_y_map: float, enemy_w: int, enemy_h: int) -> bool:
         if len(self.bullets) <= 0: # Only check collision if there are actually bullets to check for.
             return False
-        
-        for bullet in self.bullets:
-            if bullet.from_enemy:
-                continue
-
-            # Calculate the viewport coordinates because we always use viewport coords for
-            # collision detection...
-            # XXX kinda clunky, make the collision detection use map coords directly if needed.
-            x = enemy_x_map
-            y = enemy_y_map - self.game_handler.game_components.camera.y + WINDOW_HEIGHT // 2
-
-            if bullet.is_colliding(x, y, enemy_w, enemy_h):
-                self.bullets.remove(bullet) if bullet in self.bullets else None
+
+        if self._player_bullets_grid_dirty:
+            self._rebuild_player_bullets_grid()
+
+        # Calculate the viewport coordinates because we always use viewport coords for
+        # collision detection...
+        # XXX kinda clunky, make the collision detection use map coords directly if needed.
+        x = enemy_x_map
+        y = enemy_y_map - self.game_handler.game_components.camera.y + WINDOW_HEIGHT // 2
+
+        # The grid only gives the bullets near the enemy; the actual check is still done with `BulletStore.is_colliding`.
+        for row in self.player_bullets_grid.query(enemy_x_map, enemy_y_map, enemy_w, enemy_h):
+            if self.bullets.is_alive(row) and self.bullets.is_colliding(row, x, y, enemy_w, enemy_h):
+                self.bullets.kill(row)
+                self.player_bullets_grid.remove(row)
                 self.game_handler.game_components.event_handler.trigger_event(events.AppendBlastEffect(enemy_x_map, enemy_y_map, enemy_w, enemy_h))
                 self.game_handler.game_components.soundplayer.play(self.soundbank["explode"])
-                self.game_handler.game_components.event_handler.trigger_event(events.UpdateStatusbar)
                 return True
         return False
     
     def restart_level(self):
-        self.bullets = []
+        self.bullets.clear()
+        self.player_bullets_grid.clear()
+        self._player_bullets_grid_dirty = True
     
     def init_level(self):
         self.setup()
\ No newline at end of file
@@ -14,17 +14,21 @@
 
 import pyxel
 from abc import abstractmethod
+from math import sqrt
 from core.components import EventHandler
-from core.common import ALPHA_COL, Level, BLANK_UV, MAP_Y_OFFSET_TILES, ProgressStatusbarItem, EnemyType, Icon, TickerItem, Sfx, SoundType
+from core.common import ALPHA_COL, Level, BLANK_UV, MAP_Y_OFFSET_TILES, WINDOW_HEIGHT, ProgressStatusbarItem, EnemyType, Icon, TickerItem, Sfx, SoundType, RowIndex, SimulationLOD, SimulationLODStats
 from core.utils import tile_to_real
 from core.sprite_classes import Sprite, SpriteCoordinate, SpriteHandler
 from core.game_handler import GameHandler
+from core import backend
 from game import events
 
 ENEMY_SPAWNER_UV = (7, 1)
+ENEMIES_TICKER_GROUP = "enemies"
 
 class EnemyEntity(Sprite):
     health: int = 1
+    update_ticker: TickerItem
 
     def __init__(self, x_map: float, y_map: float):
         self.coord = SpriteCoordinate()
@@ -32,15 +36,86 @@ class EnemyEntity(Sprite):
         self.coord.y_map = y_map
 
     def draw(self):
-        pyxel.blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, ALPHA_COL)
+        backend.get().blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, ALPHA_COL)
     
+    def get_tickers(self) -> list[TickerItem]:
+        """
+        Get all ticker items owned by this enemy.
+        """
+        return [self.update_ticker]
+
     @abstractmethod
     def check_deletion(self) -> bool:
         pass
 
-    @abstractmethod
     def update(self):
-        pass
+        self.step() if self.update_ticker.get() else None
+
+    def coarse_update(self) -> int:
+        """
+        Catch up on all the steps the enemy should have taken since it was last updated, with a single coarse step.
+        Returns the amount of steps.
+        """
+        steps = self.update_ticker.take()
+        self.coarse_step(steps) if steps > 0 else None
+        return steps
+
+    @abstractmethod
+    def step(self):
+        """
+        Take a single movement step.
+        """
+
+    @abstractmethod
+    def coarse_step(self, steps: int):
+        """
+        Take `steps` movement steps at once. The random part of the movement is drawn once, scaled so it has the same
+        mean and variance as `steps` separate steps.
+        """
+
+class BouncingEnemyEntity(EnemyEntity):
+    """
+    An enemy that moves in a direction (with a bit of random wobbling) and bounces off the edges of the level.
+    """
+    wobble: float = 2 # the random part of each step is in -wobble..wobble
+    direction_x: float = 0
+    direction_y: float = 0
+    level_width: float = 0
+    level_height: float = 0
+
+    def step(self):
+        if self.coord.x_map < 0:
+            self.coord.x_map = 1
+            self.direction_x *= -1
+        if self.coord.x_map > self.level_width - self.w:
+            self.coord.x_map = self.level_width - self.w - 1
+            self.direction_x *= -1
+        if self.coord.y_map > self.level_height - self.h:
+            self.direction_y *= -1
+            self.coord.y_map = self.level_height - self.h - 1
+        if self.coord.y_map < 0:
+            self.direction_y *= -1
+            self.coord.y_map = 1
+
+        self.coord.x_map += self.direction_x + pyxel.rndf(-self.wobble, self.wobble)
+        self.coord.y_map += self.direction_y + pyxel.rndf(-self.wobble, self.wobble)
+
+    @staticmethod
+    def _bounce(pos: float, low: float, high: float, direction: float) -> tuple[float, float]:
+        # Fold a position that went past the edges back in, flipping the direction on each bounce
+        if high <= low:
+            return low, direction
+        while pos < low or pos > high:
+            pos = 2 * low - pos if pos < low else 2 * high - pos
+            direction *= -1
+        return pos, direction
+
+    def coarse_step(self, steps: int):
+        wobble = self.wobble * sqrt(steps)
+        x = self.coord.x_map + self.direction_x * steps + pyxel.rndf(-wobble, wobble)
+        y = self.coord.y_map + self.direction_y * steps + pyxel.rndf(-wobble, wobble)
+        self.coord.x_map, self.direction_x = self._bounce(x, 0, self.level_width - self.w, self.direction_x)
+        self.coord.y_map, self.direction_y = self._bounce(y, 0, self.level_height - self.h, self.direction_y)
 
 class EnemyGrug(EnemyEntity):
     u = 0
@@ -57,24 +132,33 @@ class EnemyGrug(EnemyEntity):
         self.level_width = tile_to_real(level.levelmap.level_width)
         self.update_ticker = ticker
 
-    def update(self):
-        if self.update_ticker.get():
-            self.coord.x_map += pyxel.rndf(-2, 2)
-            self.coord.y_map += pyxel.rndf(-2, 2)
-            if self.coord.x_map > self.level_width:
-                self.coord.x_map = self.level_width - 2
-            if self.coord.x_map < 0:
-                self.coord.x_map = 0
-            if self.coord.y_map > self.level_height:
-                self.coord.y_map = self.level_height
+    def step(self):
+        self.coord.x_map += pyxel.rndf(-2, 2)
+        self.coord.y_map += pyxel.rndf(-2, 2)
+        self._keep_in_level()
+
+    def coarse_step(self, steps: int):
+        wobble = 2 * sqrt(steps)
+        self.coord.x_map += pyxel.rndf(-wobble, wobble)
+        self.coord.y_map += pyxel.rndf(-wobble, wobble)
+        self._keep_in_level()
+
+    def _keep_in_level(self):
+        if self.coord.x_map > self.level_width:
+            self.coord.x_map = self.level_width - 2
+        if self.coord.x_map < 0:
+            self.coord.x_map = 0
+        if self.coord.y_map > self.level_height:
+            self.coord.y_map = self.level_height
         
     def check_deletion(self) -> bool:
         return self.health == 0
     
-class EnemyPhong(EnemyEntity):
+class EnemyPhong(BouncingEnemyEntity):
     u = 8
     v = 48
     health = 2
+    wobble = 2
 
     def __init__(self, x_map: float, y_map: float, level: Level, ticker: TickerItem):
         self.coord = SpriteCoordinate(-20, -20, -20, -20)
@@ -86,33 +170,14 @@ class EnemyPhong(EnemyEntity):
         self.direction_y = pyxel.rndf(1, 4)
         self.update_ticker = ticker
 
-    def update(self):
-        if not self.update_ticker.get():
-            return
-
-        if self.coord.x_map < 0:
-            self.coord.x_map = 1
-            self.direction_x *= -1
-        if self.coord.x_map > self.level_width - self.w:
-            self.coord.x_map = self.level_width - self.w - 1
-            self.direction_x *= -1
-        if self.coord.y_map > self.level_height - self.h:
-            self.direction_y *= -1
-            self.coord.y_map = self.level_height - self.h - 1
-        if self.coord.y_map < 0:
-            self.direction_y *= -1
-            self.coord.y_map = 1
-
-        self.coord.x_map += self.direction_x + pyxel.rndf(-2, 2)
-        self.coord.y_map += self.direction_y + pyxel.rndf(-2, 2)
-
     def check_deletion(self) -> bool:
         return self.health == 0
     
-class EnemySquidge(EnemyEntity):
+class EnemySquidge(BouncingEnemyEntity):
     u = 0
     v = 56
     health = 3
+    wobble = 1
 
     def __init__(self, x_map: float, y_map: float, level: Level, ticker: TickerItem, shoot_ticker: TickerItem):
         self.coord = SpriteCoordinate(-20, -20, -20, -20)
@@ -125,34 +190,28 @@ class EnemySquidge(EnemyEntity):
         self.direction_x = pyxel.rndf(-0.8, 0.8)
         self.direction_y = pyxel.rndf(-1, 1)
 
-    def update(self):
-        if not self.update_ticker.get():
-            return
-
-        if self.coord.x_map < 0:
-            self.coord.x_map = 1
-            self.direction_x *= -1
-        if self.coord.x_map > self.level_width - self.w:
-            self.coord.x_map = self.level_width - self.w - 1
-            self.direction_x *= -1
-        if self.coord.y_map > self.level_height - self.h:
-            self.direction_y *= -1
-            self.coord.y_map = self.level_height - self.h - 1
-        if self.coord.y_map < 0:
-            self.direction_y *= -1
-            self.coord.y_map = 1
-
-        self.coord.x_map += self.direction_x + pyxel.rndf(-1, 1)
-        self.coord.y_map += self.direction_y + pyxel.rndf(-1, 1)
-
-
     def check_deletion(self) -> bool:
         return self.health == 0
     
+    def get_tickers(self) -> list[TickerItem]:
+        return [self.update_ticker, self.shoot_ticker]
+
     def check_shoot(self, event_handler: EventHandler):
-        event_handler.trigger_event(events.SquidgeNearPlayer(self.coord.x_map, self.coord.y_map, self.w, self.h)) if self.shoot_ticker.get() else None
+        event_handler.trigger_event(events.SquidgeNearPlayer.reuse(self.coord.x_map, self.coord.y_map, self.w, self.h)) if self.shoot_ticker.get() else None
 
 class EnemyHandler(SpriteHandler):
+    # Enemies are kept in a row index so only the ones around the viewport are checked and drawn.
+    # The margin is bigger than the viewport's so squidges can still notice a player near the edge of the screen.
+    ENEMIES_INDEX_ROW_HEIGHT = 32
+    VISIBILITY_MARGIN = 64
+
+    # Enemies far away from the camera are simulated less often (and catch up with a coarse step).
+    # The first level should cover the visible band above so enemies on screen always move smoothly.
+    ENEMIES_LOD_LEVELS = [
+        SimulationLOD(0, 1),
+        SimulationLOD(WINDOW_HEIGHT, 4),
+        SimulationLOD(WINDOW_HEIGHT * 2, 12),
+    ]
 
     enemies_icon = [
         Icon(0, 16, 96, 8, 8),
@@ -170,6 +229,10 @@ class EnemyHandler(SpriteHandler):
         self.game_components = game_handler.game_components
         self.enemy_coordinates_list: list[tuple[int, int]] = []
         self.enemies: list[EnemyEntity] = []
+        self.enemies_index = RowIndex(self.ENEMIES_INDEX_ROW_HEIGHT)
+        self.visible_enemies: list[EnemyEntity] = [] # enemies around the viewport, found on the last update
+        self.lod_levels = list(self.ENEMIES_LOD_LEVELS)
+        self.lod_stats = SimulationLODStats([0] * len(self.lod_levels))
         self.enemies_hit_progressbar = ProgressStatusbarItem(2, 1, self.get_enemies_eliminated_count, pyxel.COLOR_WHITE, 0, 75, 10, self.enemies_icon[0], "Alien", pyxel.COLOR_WHITE)
         self.setup()
         self._reset_progressbar()
@@ -186,25 +249,21 @@ class EnemyHandler(SpriteHandler):
         self.enemies_eliminated = 0
         self.enemy_coordinates_list = self._generate_enemies_matrix()
         self.enemies_hit_progressbar.icon = self.enemies_icon[self.level.idx - 1]
+        self.enemies_hit_progressbar.invalidate()
         self.spawn()
         self.update_enemies = False
 
     def _reset_progressbar(self):
         self.enemies_hit_progressbar.progress_col = self.level.enemies_statusbar_color
-        self.enemies_hit_progressbar.new_max_val(self.enemies_count)
+        self.enemies_hit_progressbar.new_max_val(self.enemies_count) # also invalidates the item
 
     def _generate_enemies_matrix(self) -> list[tuple[int, int]]:
         """
         Get an array of enemy coordinates.
-        It works by checking each tile in the map and compares it to the current enemy type's UV coordinates.
+        It works by looking up the enemy spawner tiles in the level's tile index.
         """
         # The coordinates in this list are the _actual_ coordinates on the entire tilemap, not the game map coordinates.
-        enemies_matrix: list[tuple[int, int]] = []
-        tilemap = pyxel.tilemap(0)
-        for y in range(self.levelmap.map_y + MAP_Y_OFFSET_TILES, self.levelmap.map_y + MAP_Y_OFFSET_TILES +  self.levelmap.level_height):
-            for x in range(self.levelmap.map_x, self.levelmap.map_x + self.levelmap.level_width):
-                if tilemap.pget(x, y) == ENEMY_SPAWNER_UV:
-                    enemies_matrix.append((x, y))
+        enemies_matrix = self.game_components.tile_index.get_tile_coords(self.level, ENEMY_SPAWNER_UV)
         self.enemies_count = len(enemies_matrix)
         self.game_components.event_handler.trigger_event(events.BroadcastEnemiesCount(self.enemies_count))
         return enemies_matrix
@@ -221,63 +280,117 @@ class EnemyHandler(SpriteHandler):
         """
         Reset all spawn points. Turns all spawn point tiles to blank tiles.
         """
-        tilemap = pyxel.tilemap(0)
-        [tilemap.pset(x, y, BLANK_UV) for x, y in self.enemy_coordinates_list]
+        [backend.get().tilemap_pset(0, x, y, BLANK_UV) for x, y in self.enemy_coordinates_list]
     
     def _append_enemy(self, enemy_type: EnemyType, x: int, y: int):
 
         x = tile_to_real(x - self.levelmap.map_x)
         y = tile_to_real(y - MAP_Y_OFFSET_TILES - self.levelmap.map_y)
+        ticker = self.game_components.ticker
         match enemy_type:
             case EnemyType.ENEMY_1:
-                enemy = EnemyGrug(x, y, self.level, self.game_components.ticker.attach(pyxel.rndi(4, 8)))
+                enemy = EnemyGrug(x, y, self.level, ticker.attach(pyxel.rndi(4, 8), ENEMIES_TICKER_GROUP))
             case EnemyType.ENEMY_2:
-                enemy = EnemyPhong(x, y, self.level, self.game_components.ticker.attach(pyxel.rndi(4, 8)))
+                enemy = EnemyPhong(x, y, self.level, ticker.attach(pyxel.rndi(4, 8), ENEMIES_TICKER_GROUP))
             case EnemyType.ENEMY_3:
-                enemy = EnemySquidge(x, y, self.level, self.game_components.ticker.attach(pyxel.rndi(6, 10)), self.game_components.ticker.attach(15))
+                enemy = EnemySquidge(x, y, self.level, ticker.attach(pyxel.rndi(6, 10), ENEMIES_TICKER_GROUP), ticker.attach(15, ENEMIES_TICKER_GROUP))
         self.enemies.append(enemy)
+        self.enemies_index.insert(enemy, enemy.coord.y_map)
+
+    def _clear_enemies(self):
+        self.enemies = []
+        self.enemies_index.clear()
+        self.visible_enemies = []
 
     def _activate_enemy(self):
+        # The enemies stood still until now, so they don't have any steps to catch up on
+        for enemy in self.enemies:
+            enemy.update_ticker.reset()
         self.update_enemies = True
 
     def update(self):
-        for enemy in self.enemies:
-            enemy.map_to_view(self.game_components.camera.y)
+        cam_y = self.game_components.camera.y
+        self.visible_enemies = self.enemies_index.query(cam_y - WINDOW_HEIGHT / 2 - self.VISIBILITY_MARGIN, cam_y + WINDOW_HEIGHT / 2 + self.VISIBILITY_MARGIN)
+        eliminated_enemies: list[EnemyEntity] = []
+
+        for enemy in self.visible_enemies:
+            enemy.map_to_view(cam_y)
             # XXX try checking collision on individual sprite update instead (without the EnemiesHandler)
             # also maybe this can mean the enemy will only need to trigger one event and then the player can also have a handler
             if isinstance(enemy, EnemySquidge):
                 enemy.check_shoot(self.game_components.event_handler)
 
             if enemy.is_sprite_in_viewport() and not self.level.enemies_all_eliminated:
-                if self.game_components.event_handler.trigger_event(events.EnemiesBulletsCheck(enemy.coord.x_map, enemy.coord.y_map, enemy.w, enemy.h)):
+                if self.game_components.event_handler.trigger_event(events.EnemiesBulletsCheck.reuse(enemy.coord.x_map, enemy.coord.y_map, enemy.w, enemy.h)):
                     enemy.health -= 1
                     if enemy.check_deletion():
-                        self.enemies.remove(enemy)
+                        eliminated_enemies.append(enemy)
+                        self._detach_enemy_tickers(enemy)
                         self.game_components.soundplayer.play(self.soundbank["attacked"])
                         self.enemies_eliminated += 1
-                        self.game_components.event_handler.trigger_event(events.UpdateStatusbar)
+                        self.enemies_hit_progressbar.invalidate()
                         if self.enemies_eliminated == self.enemies_count:
                             self.level.enemies_all_eliminated = True
                             self.enemies_hit_progressbar.progress_col = pyxel.COLOR_GREEN
                             self.game_components.event_handler.trigger_event(events.CheckLevelComplete)
                 
-                self.game_components.event_handler.trigger_event(events.PlayerCollidingEnemy(enemy.coord.x, enemy.coord.y, enemy.w, enemy.h))
+                self.game_components.event_handler.trigger_event(events.PlayerCollidingEnemy.reuse(enemy.coord.x, enemy.coord.y, enemy.w, enemy.h))
+
+        for enemy in eliminated_enemies:
+            self.enemies.remove(enemy)
+            self.enemies_index.remove(enemy)
+            self.visible_enemies.remove(enemy)
+
+        self.update_enemies_simulation(cam_y) if self.update_enemies else None
+
+    def _get_lod_level(self, distance: float) -> int:
+        for level_idx in range(len(self.lod_levels) - 1, 0, -1):
+            if distance >= self.lod_levels[level_idx].min_distance:
+                return level_idx
+        return 0
 
-            enemy.update() if self.update_enemies else None
+    def update_enemies_simulation(self, cam_y: float):
+        """
+        Move the enemies, according to their level of detail.
+        """
+        stats = SimulationLODStats([0] * len(self.lod_levels))
+        frame_count = backend.get().frame_count
+        for i, enemy in enumerate(self.enemies):
+            lod_level = self._get_lod_level(abs(enemy.coord.y_map - cam_y))
+            stats.entities_per_level[lod_level] += 1
+            update_interval = self.lod_levels[lod_level].update_interval
+
+            if update_interval <= 1:
+                enemy.update()
+                stats.full_updates += 1
+            elif (frame_count + i) % update_interval == 0: # spread the coarse updates over the frames
+                stats.coarse_steps += enemy.coarse_update()
+                stats.coarse_updates += 1
+            else:
+                continue
+
+            self.enemies_index.move(enemy, enemy.coord.y_map)
+        self.lod_stats = stats
+
+    def _detach_enemy_tickers(self, enemy: EnemyEntity):
+        for ticker in enemy.get_tickers():
+            self.game_components.ticker.detach(ticker)
 
     def draw(self):
-        for enemy in self.enemies:
+        for enemy in self.visible_enemies:
             if enemy.is_sprite_in_viewport():
                 enemy.draw()
     
     def init_level(self):
-        self.enemies = []
+        self._clear_enemies()
+        self.game_components.ticker.release(ENEMIES_TICKER_GROUP)
         self.setup()
         self._reset_progressbar()
 
     def restart_level(self):
         self.update_enemies = None
-        self.enemies = []
+        self._clear_enemies()
+        self.game_components.ticker.release(ENEMIES_TICKER_GROUP)
         self.enemies_eliminated = 0
         self.spawn()
 
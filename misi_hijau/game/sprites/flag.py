@@ -19,6 +19,7 @@ from game import events
 
 class LevelFlag(TilemapBasedSprite):
     FLAG_UV = (2, 7)
+    WATCHLIST_GROUP = "flag"
     soundbank = {
         "level_finished": Sfx(SoundType.AUDIO, 0, 13)
     }
@@ -32,6 +33,8 @@ class LevelFlag(TilemapBasedSprite):
         self.level = self.game_handler.levelhandler.get_curr_lvl()
         self.level.minerals_all_collected = False
         self.level.enemies_all_eliminated = False
+        self.flag_coords = self.game_handler.game_components.tile_index.get_tile_coords(self.level, self.FLAG_UV) # actual tilemap coordinates of the level's flag(s)
+        self.game_handler.game_components.tile_watchlist.set_tiles(self.WATCHLIST_GROUP, self.flag_coords)
 
     def _is_level_complete(self) -> bool:
         return self.level.minerals_all_collected and self.level.enemies_all_eliminated
@@ -16,10 +16,12 @@ import pyxel
 
 from core.sprite_classes import TilemapBasedSprite
 from core.game_handler import GameHandler
+from core import backend
 from core.common import MineralType, Sfx, SoundType, ProgressStatusbarItem, BLANK_UV, MAP_Y_OFFSET_TILES, Icon
 from game import events
 
 class MineralsHandler(TilemapBasedSprite):
+    WATCHLIST_GROUP = "minerals"
 
     costumes = {
         "mineral_1": (1, 2),
@@ -54,7 +56,7 @@ class MineralsHandler(TilemapBasedSprite):
         self.collected_minerals = 0
         self.level = self.game_handler.levelhandler.get_curr_lvl()
         self.minerals_progressbar.icon = self.minerals_icon[self.level.idx - 1]
-        self.game_handler.game_components.event_handler.trigger_event(events.UpdateStatusbar)
+        self.minerals_progressbar.invalidate()
         mineral_type = self.level.mineral_type
         match mineral_type:
             case MineralType.MINERAL_1:
@@ -67,7 +69,7 @@ class MineralsHandler(TilemapBasedSprite):
 
     def _reset_progressbar(self):
         self.minerals_progressbar.progress_col = self.level.minerals_statusbar_color
-        self.minerals_progressbar.new_max_val(self.level.minerals_count)
+        self.minerals_progressbar.new_max_val(self.level.minerals_count) # also invalidates the item
 
     def spawn(self):
         """
@@ -76,11 +78,12 @@ class MineralsHandler(TilemapBasedSprite):
         self._clean_grid()
         self.mineral_coordinates_list = self._generate_random_mimerals_map_matrix(self.level.minerals_count, self.level.levelmap.level_width, self.level.levelmap.level_height, self.level.levelmap.map_x, self.level.levelmap.map_y)
         for x, y in self.mineral_coordinates_list:
-            pyxel.tilemap(0).pset(x, y, self.mineral_costume)
+            backend.get().tilemap_pset(0, x, y, self.mineral_costume)
+        self.game_handler.game_components.tile_watchlist.set_tiles(self.WATCHLIST_GROUP, self.mineral_coordinates_list)
     
     def _clean_grid(self):
         for x, y in self.mineral_coordinates_list:
-            pyxel.tilemap(0).pset(x, y, BLANK_UV) 
+            backend.get().tilemap_pset(0, x, y, BLANK_UV) 
 
     def _generate_random_mimerals_map_matrix(self, num_tiles: int, map_w: int, map_h: int, map_x: int, map_y: int) -> list[tuple[int, int]]:
         """
@@ -111,9 +114,10 @@ class MineralsHandler(TilemapBasedSprite):
                 self.game_handler.game_components.event_handler.trigger_event(events.CheckLevelComplete)
                 self.minerals_progressbar.progress_col = pyxel.COLOR_GREEN
 
-            self.game_handler.game_components.event_handler.trigger_event(events.UpdateStatusbar)
+            self.minerals_progressbar.invalidate()
             self.game_handler.game_components.soundplayer.play(self.soundbank["mineral_increment"])
-            pyxel.tilemap(0).pset(tile_x, tile_y, BLANK_UV)
+            backend.get().tilemap_pset(0, tile_x, tile_y, BLANK_UV)
+            self.game_handler.game_components.tile_watchlist.discard(self.WATCHLIST_GROUP, (tile_x, tile_y))
             return True
         return False
     
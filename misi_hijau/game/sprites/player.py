@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import pyxel
+from typing import Optional
 from core.sprite_classes import Sprite, SpriteCoordinate, SpriteHandler
 from core.common import (
     ALPHA_COL,
@@ -24,9 +25,11 @@ from core.common import (
     SoundType,
     KeyType,
     TextStatusbarItem,
+    TickerItem,
     MAP_Y_OFFSET_TILES
 )
 from core.game_handler import GameHandler
+from core import backend
 from .. import events
 from core.utils import tile_to_real, real_to_tile, hypotenuse
 
@@ -50,13 +53,13 @@ class Flame(Sprite):
         game_handler.game_components.event_handler.add_handler(events.FlameUpdate.name, self.flame_update)
     
     def draw(self):
-        pyxel.blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
+        backend.get().blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
 
     def update(self):
         self.hit_this_frame = False
 
         if self.ticker.get():
-            self.set_costume(self.flames[pyxel.frame_count % 2])
+            self.set_costume(self.flames[backend.get().frame_count % 2])
 
     def flame_update(self, player_x: float, player_y: float, player_h: int):
         self.coord.x = player_x
@@ -106,8 +109,8 @@ class Player(Sprite):
         self.game_handler = game_handler
 
         self.coord = SpriteCoordinate(0, 0, 0, 0)
+        self.ship3_costume_ticker: Optional[TickerItem] = None
         self.blinking_ticker = self.game_handler.game_components.ticker.attach(10)
-        self.speed_statusbar_ticker = self.game_handler.game_components.ticker.attach(10)
 
         self.player_setup()
         self.setup_event_handlers()
@@ -116,6 +119,7 @@ class Player(Sprite):
         self.game_handler.game_components.event_handler.add_handler(events.PlayerCollidingEnemy.name, self.is_colliding_with_enemy)
         self.game_handler.game_components.event_handler.add_handler(events.DecreasePlayerHealth.name, self.alter_health)
         self.game_handler.game_components.event_handler.add_handler(events.SquidgeNearPlayer.name, self.shoot_if_near_squidge)
+        self.game_handler.game_components.event_handler.add_handler(events.CheckLevelComplete.name, self.recheck_tile)
 
     def player_setup(self):
         """
@@ -123,6 +127,7 @@ class Player(Sprite):
         """
         self.x_vel = 0
         self.y_vel = 0
+        self.last_tile: Optional[tuple[int, int]] = None # tile the player was on when it was last checked
 
         self.level = self.game_handler.levelhandler.get_curr_lvl()
 
@@ -136,6 +141,8 @@ class Player(Sprite):
         self.map_to_view(self.game_handler.game_components.camera.y)
 
         if self.level.idx:
+            if self.ship3_costume_ticker:
+                self.game_handler.game_components.ticker.detach(self.ship3_costume_ticker) # don't stack tickers on every setup
             self.ship3_costume_ticker = self.game_handler.game_components.ticker.attach(5)
             self.ship3_costume_idx = False
 
@@ -190,14 +197,22 @@ class Player(Sprite):
     def player_tilemap_checker(self):
         """
         Get the current tilemap U,V and then fire events based on the tilemap (`minerals_check` or `check_level_complete`).
+        Only done when the player enters a new tile which is in the tile watchlist (e.g. minerals and flags).
         """
 
         # ↓ These tiles are the _actual_ tile coordinates from the entire tilemap (not the map coordinates!).
         tile_x = real_to_tile(self.coord.x_map) + self.level.levelmap.map_x + 1
         tile_y = real_to_tile(self.coord.y_map) + self.level.levelmap.map_y + 1 + MAP_Y_OFFSET_TILES
 
-        tilemap = pyxel.tilemap(0).pget(tile_x, tile_y)
-        self.game_handler.game_components.event_handler.trigger_event(events.TilemapPlayerCheck(tilemap, tile_x, tile_y))
+        tile = (tile_x, tile_y)
+        if tile == self.last_tile:
+            return
+        self.last_tile = tile
+        if tile not in self.game_handler.game_components.tile_watchlist:
+            return
+
+        tilemap = backend.get().tilemap_pget(0, tile_x, tile_y)
+        self.game_handler.game_components.event_handler.trigger_event(events.TilemapPlayerCheck.reuse(tilemap, tile_x, tile_y))
 
     def move(self):
         self.player_tilemap_checker()
@@ -240,14 +255,12 @@ class Player(Sprite):
 
         self.move()
 
-        self.update_speed_statusbar()
-
         self.update_if_has_been_hit()
 
-        self.game_handler.game_components.event_handler.trigger_event(events.FlameUpdate(self.coord.x, self.coord.y, self.h))
+        self.game_handler.game_components.event_handler.trigger_event(events.FlameUpdate.reuse(self.coord.x, self.coord.y, self.h))
             
         if self.level.idx == 3:
-            if self.ship3_costume_ticker.get() and not self.has_been_hit:
+            if self.ship3_costume_ticker and self.ship3_costume_ticker.get() and not self.has_been_hit:
                 self.ship3_costume_idx = not self.ship3_costume_idx
                 self.ship3_costume_set()
 
@@ -258,10 +271,6 @@ class Player(Sprite):
                 self.hit_blink_idx = not self.hit_blink_idx
             self.draw_if_hit()
 
-    def update_speed_statusbar(self):
-        if self.speed_statusbar_ticker.get():
-            self.game_handler.game_components.event_handler.trigger_event(events.UpdateStatusbar)
-
     def draw_if_hit(self):
         if self.hit_blink_idx:
             self.switch_to_blink_costume(self.ship_type)
@@ -275,7 +284,7 @@ class Player(Sprite):
 
     def draw(self):
 
-        pyxel.blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
+        backend.get().blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
 
     def level_reset(self):
         self.player_setup()
@@ -304,7 +313,14 @@ class Player(Sprite):
             self.game_handler.game_components.event_handler.trigger_event(events.LevelRestart)
         return True
 
+    def recheck_tile(self):
+        """
+        Check the current tile again on the next frame, even if the player doesn't move (e.g. a flag that can only be used once the level is complete).
+        """
+        self.last_tile = None
+
     def restart_state(self):
+        self.last_tile = None
         self.coord.x_map = self.level_width // 2
         self.coord.y_map = self.level_height - tile_to_real(4)
         self.x_vel = 0
@@ -324,6 +340,7 @@ class PlayerHandler(SpriteHandler):
         self.player = Player(self.game_handler)
         self.flame = Flame(self.game_handler)
         self.check_for_enemy_bullets = False
+        self.speed_statusbar_ticker: Optional[TickerItem] = None
         self.setup()
 
         self.keybindings = {
@@ -333,8 +350,9 @@ class PlayerHandler(SpriteHandler):
             "player_down": KeyFunc([pyxel.KEY_DOWN, pyxel.KEY_S], lambda: self.player.move_handler(Direction.DOWN), active=False),
             "player_shoot": KeyFunc([pyxel.KEY_SPACE], self.shoot_handler, KeyType.BTNP, hold_time=10, repeat_time=10, active=False),
         }
+        self.speed_statusbar_item = TextStatusbarItem(100, self.get_player_speed, pyxel.COLOR_YELLOW)
         self.statusbar_items = [
-            TextStatusbarItem(100, self.get_player_speed, pyxel.COLOR_YELLOW),
+            self.speed_statusbar_item,
         ]
 
     def _alter_player_keys_state(self, state: bool):
@@ -351,6 +369,10 @@ class PlayerHandler(SpriteHandler):
         else:
             self.has_flame = True
 
+        if self.speed_statusbar_ticker:
+            self.game_handler.game_components.ticker.detach(self.speed_statusbar_ticker) # don't stack tickers on every setup
+        self.speed_statusbar_ticker = self.game_handler.game_components.ticker.attach(10)
+
     def draw(self):
         if self.has_flame:
             self.flame.draw()
@@ -362,10 +384,12 @@ class PlayerHandler(SpriteHandler):
             self.flame.update()
         
         if self.check_for_enemy_bullets:
-            self.game_handler.game_components.event_handler.trigger_event(events.PlayerBulletsCheck(self.player.coord.x, self.player.coord.y, self.player.w, self.player.h))
+            self.game_handler.game_components.event_handler.trigger_event(events.PlayerBulletsCheck.reuse(self.player.coord.x, self.player.coord.y, self.player.w, self.player.h))
 
         self.player.update()
 
+        self.update_speed_statusbar()
+
     def init_level(self):
         self.setup()
         self.player.player_setup()
@@ -380,6 +404,10 @@ class PlayerHandler(SpriteHandler):
         self.game_handler.game_components.soundplayer.play(self.soundbank["shoot"])
 
     # Functions for statusbar
+    def update_speed_statusbar(self):
+        if self.speed_statusbar_ticker and self.speed_statusbar_ticker.get():
+            self.speed_statusbar_item.invalidate()
+
     def get_player_speed(self) -> str:
 
         magnitude = pyxel.floor(
@@ -13,10 +13,10 @@
 # limitations under the License.
 
 # Imports
-import pyxel
 from core.sprite_classes import TilemapBasedSprite
 from core.common import PowerUpType, PowerUp
 from core.game_handler import GameHandler
+from core import backend
 from core.utils import tile_to_real
 
 # NOTE: I didn't implement this... sad
@@ -55,8 +55,7 @@ class PowerUpHandler(TilemapBasedSprite):
                 return self.costumes["speed_boost"]
 
     def spawn(self):
-        tilemap = pyxel.tilemap(0)
         for powerup in self.powerup_coordinates_list:
             x = powerup.x + tile_to_real(self.levelmap.level_width)
             y = powerup.y + tile_to_real(self.levelmap.level_height)
-            tilemap.pset(x, y, self.get_powerup_uv_from_type(powerup.powerup_type))
\ No newline at end of file
+            backend.get().tilemap_pset(0, x, y, self.get_powerup_uv_from_type(powerup.powerup_type))
\ No newline at end of file
@@ -19,8 +19,9 @@ from res.storyline_text import story_text
 
 from game.game_ui.blinking_text_hint import BLINKING_TEXT_HINT_TIMER_ID
 from core.game_handler import GameHandler
+from core import backend
 from core.common import WINDOW_HEIGHT, WINDOW_WIDTH, KeyFunc, Sfx, SoundType
-from res.resources_load import INTRO_SLIDESHOW_IMAGE_PATH, SPLASH_SCREEN_IMAGE, INSTRUCTIONS_IMAGE_PATH, TEMP_IMG_BANK_IDX
+from res.resources_load import INTRO_SLIDESHOW_IMAGE_PATH, SPLASH_SCREEN_IMAGE, INSTRUCTIONS_IMAGE_PATH, TEMP_IMG_BANK_IDX, image_cache
 from .. import events
 
 class IntroPlayer:
@@ -57,10 +58,11 @@ class IntroPlayer:
     ##################
 
     def slide_intro(self):
-        pyxel.image(TEMP_IMG_BANK_IDX).load(0, 0, SPLASH_SCREEN_IMAGE)
-        pyxel.blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
-        pyxel.text(5, WINDOW_HEIGHT - 10, "(C) 2023 Cikitta", pyxel.COLOR_WHITE)
+        image_cache.load_to_bank(TEMP_IMG_BANK_IDX, SPLASH_SCREEN_IMAGE)
+        backend.get().blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        backend.get().text(5, WINDOW_HEIGHT - 10, "(C) 2023 Cikitta", pyxel.COLOR_WHITE)
         self.game_handler.game_components.timer.attach(4.8).when_over(self._show_slideshow_slide) # start slideshow after 5 seconds
+        image_cache.prefetch(self._get_slide_image_path(self.slideshow_idx)) # decode the first slide while the splash screen is shown
         
     def _show_slideshow_slide(self):
         self._post_slideshow_show()
@@ -68,6 +70,7 @@ class IntroPlayer:
         self._load_slide_background_image(self.slideshow_idx)
         self._draw_background()
         self._play_slide_sfx()
+        self._prefetch_next_image() # decode the next image while this slide is being typed out
 
         self.game_handler.game_components.event_handler.trigger_event(
             events.TextEngineAnimateText(
@@ -87,11 +90,23 @@ class IntroPlayer:
     def _play_slide_sfx(self):
         self.game_handler.game_components.soundplayer.play(self.soundbank["start_sfx"])
     
+    def _get_slide_image_path(self, idx: int) -> str:
+        return os.path.join(INTRO_SLIDESHOW_IMAGE_PATH, f"{idx}.png")
+
     def _load_slide_background_image(self, idx: int):
-        pyxel.image(TEMP_IMG_BANK_IDX).load(0, 0, os.path.join(INTRO_SLIDESHOW_IMAGE_PATH, f"{idx}.png"))
+        image_cache.load_to_bank(TEMP_IMG_BANK_IDX, self._get_slide_image_path(idx))
+
+    def _prefetch_next_image(self):
+        """
+        Prefetch the image after the current slide (the next slide or the instructions).
+        """
+        if self.slideshow_idx < self.INTRO_SLIDESHOW_COUNT:
+            image_cache.prefetch(self._get_slide_image_path(self.slideshow_idx + 1))
+        else:
+            image_cache.prefetch(INSTRUCTIONS_IMAGE_PATH)
     
     def _draw_background(self):
-        pyxel.blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, 256, 256) # draw background image
+        backend.get().blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, 256, 256) # draw background image
 
     def _post_slideshow_show(self):
         """
@@ -109,10 +124,10 @@ class IntroPlayer:
 
     def show_instructions(self):
         self._post_slideshow_show()
-        pyxel.image(TEMP_IMG_BANK_IDX).load(0, 0, INSTRUCTIONS_IMAGE_PATH)
+        image_cache.load_to_bank(TEMP_IMG_BANK_IDX, INSTRUCTIONS_IMAGE_PATH)
         self.game_handler.game_components.soundplayer.play(self.soundbank["instruction_sfx"])
         self.game_handler.game_components.timer.attach(1, BLINKING_TEXT_HINT_TIMER_ID).when_over(self.enable_spacebar_hint)
-        pyxel.blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, 256, 256)
+        backend.get().blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, 256, 256)
 
     ################
     # Key handlers #
@@ -16,8 +16,9 @@ import pyxel
 
 from core.sprite_classes import Sprite
 from core.game_handler import GameHandler
+from core import backend
 from core.common import WINDOW_HEIGHT, WINDOW_WIDTH, KeyFunc, Sfx, SoundType
-from res.resources_load import FINISH_SCREEN_IMAGE_PATH, TEMP_IMG_BANK_IDX
+from res.resources_load import FINISH_SCREEN_IMAGE_PATH, TEMP_IMG_BANK_IDX, image_cache
 from res.storyline_text import story_text
 from game import events
 
@@ -50,7 +51,7 @@ class OutroPlane(Sprite):
         self.coord.y -= self.speed
 
     def draw(self):
-        pyxel.blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
+        backend.get().blt(self.coord.x, self.coord.y, self.img, self.u, self.v, self.w, self.h, self.colkey)
 
 class OutroPlayer:
     outro_music = Sfx(SoundType.MUSIC, 2, 1)
@@ -68,6 +69,7 @@ class OutroPlayer:
         self.game_handler.game_components.timer.attach(3).when_over(self.show_outro_text)
         self.game_handler.callable_update = self.update
         self.game_handler.callable_draw = self.draw
+        self.load_background()
         self.draw_background()
         self._setup_keylistener()
     
@@ -76,9 +78,12 @@ class OutroPlayer:
         self.exit_game_keyfunc = KeyFunc([pyxel.KEY_Q, pyxel.KEY_ESCAPE], self.quit_game, active=False)
         self.game_handler.game_components.keylistener.add("exit_game", self.exit_game_keyfunc)
     
+    def load_background(self):
+        # Only load the background once: the draw loop just blits it from the image bank.
+        image_cache.load_to_bank(TEMP_IMG_BANK_IDX, FINISH_SCREEN_IMAGE_PATH)
+
     def draw_background(self):
-        pyxel.image(TEMP_IMG_BANK_IDX).load(0, 0, FINISH_SCREEN_IMAGE_PATH)
-        pyxel.blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        backend.get().blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
 
     def show_outro_text(self):
         self.game_handler.game_components.event_handler.trigger_event(events.TextEngineAnimateText(
@@ -112,4 +117,5 @@ class OutroPlayer:
                 self.plane = None
     
     def quit_game(self):
-        pyxel.quit()
\ No newline at end of file
+        self.game_handler.game_components.event_handler.trigger_event(events.QuitGame)
+        backend.get().quit()
\ No newline at end of file
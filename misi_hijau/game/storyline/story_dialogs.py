@@ -17,10 +17,11 @@ import os
 
 from core.common import WINDOW_WIDTH, WINDOW_HEIGHT, KeyFunc, KeyType
 from core.game_handler import GameHandler
+from core import backend
 from game import events
 
 from res.storyline_text import story_text
-from res.resources_load import LEVEL_STATS_IMAGE_PATH, TEMP_IMG_BANK_IDX
+from res.resources_load import LEVEL_STATS_IMAGE_PATH, TEMP_IMG_BANK_IDX, image_cache
 
 class InGameStoryline:
 
@@ -61,6 +62,7 @@ class InGameStoryline:
     def show_dialog_handler(self):
         curr_level_idx = self.level_handler.get_curr_lvl().idx - 1
         self._show_dialog_by_level_idx(curr_level_idx)
+        image_cache.prefetch(self._get_level_stats_image_path(curr_level_idx + 1)) # the stats image will be needed when this level is finished
 
     def _show_dialog_by_level_idx(self, level_idx: int):
         self.event_handler.trigger_event(
@@ -127,8 +129,8 @@ class InGameStoryline:
         self.close_stats_keyfunc.active = state
 
     def _draw_stats_text(self):
-        pyxel.text(self.ENEMIES_STATS_COORD[0], self.ENEMIES_STATS_COORD[1], self._get_enemies_stats_str(), self.STATS_TEXT_COL) # enemies
-        pyxel.text(self.MINERALS_STATS_COORD[0], self.MINERALS_STATS_COORD[1], self._get_minerals_stats_str(), self.STATS_TEXT_COL) # minerals
+        backend.get().text(self.ENEMIES_STATS_COORD[0], self.ENEMIES_STATS_COORD[1], self._get_enemies_stats_str(), self.STATS_TEXT_COL) # enemies
+        backend.get().text(self.MINERALS_STATS_COORD[0], self.MINERALS_STATS_COORD[1], self._get_minerals_stats_str(), self.STATS_TEXT_COL) # minerals
     
     def _get_minerals_count(self):
         # The amount of minerals is accessible through the game's level.
@@ -152,6 +154,9 @@ class InGameStoryline:
         self.alter_keylistener_state(False)
         self.event_handler.trigger_event(events.LevelNext)
 
+    def _get_level_stats_image_path(self, idx: int) -> str:
+        return os.path.join(LEVEL_STATS_IMAGE_PATH, f"{idx}.png")
+
     def _load_draw_level_stats_background(self, idx: int):
-        pyxel.image(TEMP_IMG_BANK_IDX).load(0, 0, os.path.join(LEVEL_STATS_IMAGE_PATH, f"{idx}.png"))
-        pyxel.blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
\ No newline at end of file
+        image_cache.load_to_bank(TEMP_IMG_BANK_IDX, self._get_level_stats_image_path(idx))
+        backend.get().blt(0, 0, TEMP_IMG_BANK_IDX, 0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
\ No newline at end of file
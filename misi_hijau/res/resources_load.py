@@ -12,12 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pyxel
+import mmap
 import os
+import struct
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+from core import backend
 
 PYXEL_RESOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "res.pyxres")
 
 IMG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img")
+IMAGE_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "img_bundle.bin") # built by `build_image_bundle.py`
 
 TEMP_IMG_BANK_IDX = 1
 SPLASH_SCREEN_IMAGE = os.path.join(IMG_PATH, "game_splash_screen.png")
@@ -28,6 +34,223 @@ FINISH_SCREEN_IMAGE_PATH = os.path.join(IMG_PATH, "finish_screen.png")
 
 # FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font", "PIXELADE.ttf")
 
+# Image bundle format
+IMAGE_BUNDLE_MAGIC = b"MHIB"
+IMAGE_BUNDLE_VERSION = 1
+IMAGE_BUNDLE_HEADER = struct.Struct("<4sBHHH") # magic, version, frame width, frame height, frames count
+IMAGE_BUNDLE_ENTRY = struct.Struct("<HI") # name length (the name follows), frame offset
+IMAGE_BUNDLE_ALIGN = 4096 # frames start on a page boundary
+
+def write_image_bundle(path: str, width: int, height: int, frames: dict[str, bytes]):
+    """
+    Write an image bundle: a header, an index of the frame names (image paths relative to `IMG_PATH`, with `/` as separator)
+    and then the frames, each being `width` × `height` palette color indices (one byte per pixel, row by row).
+    """
+    index_size = IMAGE_BUNDLE_HEADER.size + sum(IMAGE_BUNDLE_ENTRY.size + len(name.encode()) for name in frames)
+    data_start = -(-index_size // IMAGE_BUNDLE_ALIGN) * IMAGE_BUNDLE_ALIGN
+
+    index = bytearray(IMAGE_BUNDLE_HEADER.pack(IMAGE_BUNDLE_MAGIC, IMAGE_BUNDLE_VERSION, width, height, len(frames)))
+    for i, name in enumerate(frames):
+        encoded_name = name.encode()
+        index += IMAGE_BUNDLE_ENTRY.pack(len(encoded_name), data_start + i * width * height) + encoded_name
+
+    with open(path, "wb") as bundle_file:
+        bundle_file.write(index.ljust(data_start, b"\0"))
+        for frame in frames.values():
+            if len(frame) != width * height:
+                raise ValueError(f"image bundle frames must be {width}×{height} pixels")
+            bundle_file.write(frame)
+
+class ImageBundle:
+    """
+    Images packed by `build_image_bundle.py`, already converted to palette color indices, so loading one to an image bank is
+    just a copy (no PNG decoding). The file is memory-mapped, so only the frames that are actually used get read.
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as bundle_file:
+            try:
+                self.data: mmap.mmap | bytes = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_COPY) # copy-on-write, so the frames can be passed as writable buffers
+            except (OSError, ValueError): # no mmap (e.g. on the web build)
+                self.data = bundle_file.read()
+
+        magic, version, self.width, self.height, frames_count = IMAGE_BUNDLE_HEADER.unpack_from(self.data)
+        if magic != IMAGE_BUNDLE_MAGIC or version != IMAGE_BUNDLE_VERSION:
+            raise ValueError(f"{path} is not a Misi Hijau image bundle (version {IMAGE_BUNDLE_VERSION})")
+
+        self.frames: dict[str, int] = {} # name -> offset
+        pos = IMAGE_BUNDLE_HEADER.size
+        for _ in range(frames_count):
+            name_len, offset = IMAGE_BUNDLE_ENTRY.unpack_from(self.data, pos)
+            pos += IMAGE_BUNDLE_ENTRY.size
+            self.frames[bytes(self.data[pos:pos + name_len]).decode()] = offset
+            pos += name_len
+
+    @staticmethod
+    def get_frame_name(path: str) -> str:
+        return os.path.relpath(path, IMG_PATH).replace(os.sep, "/")
+
+    def get(self, path: str) -> Optional[memoryview]:
+        """
+        Get the pixels of the image at `path`, or `None` if it isn't in the bundle.
+        """
+        offset = self.frames.get(self.get_frame_name(path))
+        if offset is None:
+            return None
+        return memoryview(self.data)[offset:offset + self.width * self.height]
+
+class ImageCache:
+    """
+    Cache of decoded images. Each image file is only read from disk and decoded once; after that, loading it to an image bank is just a copy.
+
+    Images that will be needed soon can be decoded on a worker thread with `prefetch`, so that loading them later doesn't
+    cause a hitch. If threads aren't available (e.g. on the web build), prefetching does nothing and the image is just
+    decoded when it's needed.
+
+    Disk reads done by the game loop are counted (in total and per frame) so the I/O done by a scene can be measured.
+    Prefetched reads are counted separately, as they don't block the game loop.
+
+    If the image bundle (`IMAGE_BUNDLE_PATH`) has been built, images in it are copied from there to the image bank instead
+    (counted as `bundle_loads`), without decoding anything.
+    """
+    def __init__(self, bundle_path: str = IMAGE_BUNDLE_PATH):
+        self.bundle_path = bundle_path
+        self._bundle: Optional[ImageBundle] = None
+        self._bundle_opened = False
+        self.bundle_loads = 0
+        self._images: dict[str, Any] = {}
+        self._prefetching: dict[str, Future[Any]] = {}
+        self._prefetch_worker: ThreadPoolExecutor | None = None
+        self.disk_reads = 0
+        self.prefetch_reads = 0
+        self.cache_hits = 0
+        self._frame = -1
+        self._frame_disk_reads = 0
+
+    def get(self, path: str) -> Any:
+        """
+        Get a decoded image, reading it from disk if it isn't cached yet.
+        If the image is still being prefetched, this will wait for it.
+        """
+        image = self._images.get(path)
+        if image is not None:
+            self.cache_hits += 1
+            return image
+
+        prefetched_image = self._prefetching.pop(path, None)
+        if prefetched_image is not None:
+            try:
+                image = prefetched_image.result()
+                self._images[path] = image
+                self.prefetch_reads += 1
+                return image
+            except Exception: # decode it again below, so the error (if any) shows up in the game loop
+                pass
+
+        image = backend.get().decode_image(path)
+        self._images[path] = image
+        self._count_disk_read()
+        return image
+
+    def _get_bundle(self) -> Optional[ImageBundle]:
+        if not self._bundle_opened:
+            self._bundle_opened = True
+            self._bundle = ImageBundle(self.bundle_path) if os.path.exists(self.bundle_path) else None
+        return self._bundle
+
+    def prefetch(self, path: str):
+        """
+        Start decoding an image on a worker thread.
+        """
+        if path in self._images or path in self._prefetching:
+            return
+
+        bundle = self._get_bundle()
+        if bundle and bundle.get_frame_name(path) in bundle.frames: # nothing to decode
+            return
+
+        try:
+            if not self._prefetch_worker:
+                self._prefetch_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image_prefetch")
+            self._prefetching[path] = self._prefetch_worker.submit(backend.get().decode_image, path)
+        except RuntimeError: # no threads available; load synchronously on demand instead
+            pass
+
+    def load_to_bank(self, img: int, path: str, x: int = 0, y: int = 0):
+        """
+        Load an image to an image bank.
+        """
+        bundle = self._get_bundle()
+        frame = bundle.get(path) if bundle else None
+        if bundle and frame is not None:
+            backend.get().copy_image_data(img, x, y, bundle.width, bundle.height, frame)
+            self.bundle_loads += 1
+            return
+        backend.get().copy_image(img, x, y, self.get(path))
+
+    def clear(self):
+        self._images = {}
+        self._prefetching = {}
+
+    def _count_disk_read(self):
+        self.disk_reads += 1
+        frame = backend.get().frame_count
+        if frame != self._frame:
+            self._frame = frame
+            self._frame_disk_reads = 0
+        self._frame_disk_reads += 1
+
+    def get_frame_disk_reads(self) -> int:
+        """
+        Get the amount of images read from disk on the current frame.
+        """
+        if backend.get().frame_count != self._frame:
+            return 0
+        return self._frame_disk_reads
+
+image_cache = ImageCache()
+
+# Parts of the Pyxel resource file
+RESOURCE_IMAGES = "image"
+RESOURCE_TILEMAPS = "tilemap"
+RESOURCE_SOUNDS = "sound"
+RESOURCE_MUSIC = "music"
+
+class ResourceManager:
+    """
+    Loads the parts of the Pyxel resource file (images, tilemaps, sounds and music) the first time they're required,
+    instead of loading the whole file on startup. The intro only needs the sounds and the music; the images and tilemaps
+    (most of the file) are loaded when the game starts.
+
+    Careful: loading the images overwrites every image bank, including `TEMP_IMG_BANK_IDX`.
+    """
+    PARTS = (RESOURCE_IMAGES, RESOURCE_TILEMAPS, RESOURCE_SOUNDS, RESOURCE_MUSIC)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.loaded: set[str] = set()
+
+    def require(self, *parts: str):
+        """
+        Make sure the parts are loaded. Parts that have already been loaded are skipped.
+        """
+        missing = [part for part in parts if part not in self.loaded]
+        if not missing:
+            return
+        backend.get().load_resources(self.path, **{part: part in missing for part in self.PARTS})
+        self.loaded.update(missing)
+
+    def reset(self):
+        """
+        Forget what has been loaded, so every part gets loaded again the next time it's required.
+        """
+        self.loaded = set()
+
+resources = ResourceManager(PYXEL_RESOURCE_PATH)
+
 def startup_load_resources():
-    pyxel.load(PYXEL_RESOURCE_PATH)
-    pyxel.image(1).load(0, 0, SPLASH_SCREEN_IMAGE)
\ No newline at end of file
+    """
+    Load what the first scene (the intro) needs. Everything else is loaded again when required, so this also works for
+    starting over from scratch (levels modify the tilemap).
+    """
+    resources.reset()
+    resources.require(RESOURCE_SOUNDS, RESOURCE_MUSIC)
\ No newline at end of file
@@ -0,0 +1,117 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Startup benchmark. Starts the game in fresh Python processes (without a window) and reports the time it takes to get to the
+first frame, as JSON.
+
+Usage: `python misi_hijau/startup_benchmark.py [--runs N] [--output FILE]`
+
+Each run is split into phases, measured inside the game process:
+- `imports`: importing the game modules (and Pyxel)
+- `init`: initializing the backend and loading the startup resources
+- `game`: building the `Game` object (which also starts the intro)
+- `first_frame`: running the first frame
+`time_to_first_frame` is measured from outside, from starting the process until the first frame is done, so it also includes
+starting up the Python interpreter.
+"""
+
+# Only the standard library is imported here, so the game imports can be timed in the child process
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from time import perf_counter
+
+DEFAULT_RUNS = 10
+PHASES = ("imports", "init", "game", "first_frame")
+
+def run_child():
+    """
+    Start the game, run a single frame and print the phase timings (in milliseconds) as one JSON line.
+    """
+    times = [perf_counter()]
+    from core import backend
+    from core.common import FPS, WINDOW_WIDTH, WINDOW_HEIGHT
+    from game.game import Game
+    from res.resources_load import startup_load_resources
+    times.append(perf_counter())
+
+    headless_backend = backend.HeadlessBackend()
+    backend.set_backend(headless_backend)
+    headless_backend.init(WINDOW_WIDTH, WINDOW_HEIGHT, title="Misi Hijau", fps=FPS)
+    startup_load_resources()
+    times.append(perf_counter())
+
+    game = Game()
+    times.append(perf_counter())
+
+    headless_backend.step(game.update, game.draw)
+    times.append(perf_counter())
+
+    print(json.dumps({phase: (end - start) * 1000 for phase, start, end in zip(PHASES, times, times[1:])}), flush=True)
+
+def run_startup() -> dict[str, float]:
+    """
+    Start the game in a new process and return its timings.
+    """
+    start = perf_counter()
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--child"], stdout=subprocess.PIPE, text=True)
+    assert child.stdout
+    line = child.stdout.readline()
+    time_to_first_frame = (perf_counter() - start) * 1000
+    child.wait()
+    if child.returncode != 0 or not line:
+        raise RuntimeError(f"the game process exited with code {child.returncode}")
+
+    results: dict[str, float] = json.loads(line)
+    results["time_to_first_frame"] = time_to_first_frame
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the Misi Hijau startup time.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="amount of times to start the game")
+    parser.add_argument("--output", help="write the JSON report to this file instead of printing it")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    runs = [run_startup() for _ in range(args.runs)]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "startup_ms": {
+            phase: {
+                "mean": sum(run[phase] for run in runs) / len(runs),
+                "min": min(run[phase] for run in runs),
+                "max": max(run[phase] for run in runs)
+            } for phase in (*PHASES, "time_to_first_frame")
+        }
+    }
+
+    report_json = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(report_json + "\n")
+    else:
+        print(report_json)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Shared fixtures. The game is run without a window, on the `HeadlessBackend`.
+"""
+
+import os
+import sys
+
+import pytest
+
+# The game modules are imported relative to the `misi_hijau` directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "misi_hijau"))
+
+import pyxel
+
+from core import backend
+from core.common import FPS, WINDOW_WIDTH, WINDOW_HEIGHT
+
+@pytest.fixture
+def headless():
+    """
+    A fresh `HeadlessBackend`, set as the current backend.
+    """
+    from res.resources_load import resources, startup_load_resources
+
+    pyxel.rseed(1)
+    headless_backend = backend.HeadlessBackend()
+    backend.set_backend(headless_backend)
+    headless_backend.init(WINDOW_WIDTH, WINDOW_HEIGHT, title="Misi Hijau", fps=FPS)
+    resources.reset()
+    startup_load_resources()
+    yield headless_backend
+    backend.set_backend(backend.PyxelBackend())
+
+@pytest.fixture
+def game(headless: backend.HeadlessBackend):
+    """
+    A `Game` that is still in the intro.
+    """
+    from game.game import Game
+    return Game()
+
+@pytest.fixture
+def start_level(game, headless: backend.HeadlessBackend):
+    """
+    Get a function that skips the intro and starts playing the first level at frame `start_frame`.
+    """
+    from game import events
+
+    def start(start_frame: int = 0):
+        event_handler = game.game_handler.game_components.event_handler
+        headless._frame_count = max(headless.frame_count, start_frame)
+        event_handler.trigger_event(events.StartGame)
+        event_handler.trigger_event(events.ActivateLevel)
+    return start
@@ -0,0 +1,36 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from game.sprites.bullets import BulletsHandler
+
+def get_bullets_handler(game) -> BulletsHandler:
+    return next(handler for handler in game.game_handler.game_components.game_sprites.sprites_handler if isinstance(handler, BulletsHandler))
+
+def test_oldest_overlapping_bullet_hits_first(game, start_level):
+    start_level()
+    bullets_handler = get_bullets_handler(game)
+    bullets = bullets_handler.bullets
+    cam_y = game.game_handler.game_components.camera.y
+
+    far_away = bullets.append(0, 0, cam_y, 1, 0, 0, 2, 8, False)
+    oldest = bullets.append(50, cam_y, cam_y, 1, 0, 0, 2, 8, False)
+    middle = bullets.append(50, cam_y, cam_y, 1, 0, 0, 2, 8, False)
+    bullets.kill(far_away) # moves `middle` in front of `oldest` in the pool
+    newest = bullets.append(50, cam_y, cam_y, 1, 0, 0, 2, 8, False) # reuses the row of `far_away`
+    bullets_handler._player_bullets_grid_dirty = True
+
+    assert bullets.get_rows(from_enemy=False) == [oldest, middle, newest]
+    assert bullets_handler.bullets_colliding_enemy_check_handler(48, cam_y, 8, 8)
+    assert not bullets.is_alive(oldest)
+    assert bullets.is_alive(middle) and bullets.is_alive(newest)
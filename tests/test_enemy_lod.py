@@ -0,0 +1,38 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from game.sprites.enemy import EnemyEntity, EnemyHandler
+
+START_FRAME = 3000
+
+def test_first_coarse_step_is_bounded_by_the_lod_interval(game, headless, start_level, monkeypatch):
+    coarse_steps: list[int] = []
+    coarse_update = EnemyEntity.coarse_update
+    def recording_coarse_update(enemy: EnemyEntity) -> int:
+        steps = coarse_update(enemy)
+        coarse_steps.append(steps)
+        return steps
+    monkeypatch.setattr(EnemyEntity, "coarse_update", recording_coarse_update)
+
+    start_level(START_FRAME)
+    enemy_handler = next(handler for handler in game.game_handler.game_components.game_sprites.sprites_handler if isinstance(handler, EnemyHandler))
+    longest_interval = max(lod.update_interval for lod in enemy_handler.lod_levels)
+    shortest_limit = min(enemy.update_ticker.limit for enemy in enemy_handler.enemies)
+
+    for _ in range(longest_interval):
+        headless.step(game.update, game.draw)
+
+    assert coarse_steps, "no enemy was coarse-simulated"
+    # Every enemy got at most one coarse update so far, which can only catch up on the frames since the level started
+    assert max(coarse_steps) <= longest_interval // shortest_limit + 1
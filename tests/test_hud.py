@@ -0,0 +1,57 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pyxel
+
+from core.common import TextStatusbarItem
+from core.components import HudLayer
+from game import events
+
+def test_open_dialog_covers_the_hud(game, headless, start_level, monkeypatch):
+    start_level()
+    game.game_handler.game_components.event_handler.trigger_event(events.ShowDialog(
+        " ".join(["word"] * 200), 100, pyxel.COLOR_BLACK, pyxel.COLOR_WHITE, 5
+    ))
+    dialog = game.game_handler.game_components.game_ui.ui_components["dialog"]
+    assert dialog.coord.y < HudLayer.LAYER_HEIGHT, "the dialog should be tall enough to reach the HUD"
+
+    draw_calls: list[tuple[str, tuple]] = []
+    monkeypatch.setattr(headless, "rect", lambda *args: draw_calls.append(("rect", args)))
+    monkeypatch.setattr(headless, "blt", lambda *args: draw_calls.append(("blt", args)))
+    headless.step(game.update, game.draw)
+
+    hud_blit = next(i for i, (kind, args) in enumerate(draw_calls) if kind == "blt" and args[2] is game.hud_layer.image)
+    dialog_rect = next(i for i, (kind, args) in enumerate(draw_calls) if kind == "rect" and args[:4] == (dialog.coord.x, dialog.coord.y, dialog.w, dialog.h))
+    assert hud_blit < dialog_rect
+
+def test_statusbar_draw_leaves_refreshing_to_update(game, headless, start_level):
+    start_level()
+    calls: list[int] = []
+    def function() -> str:
+        calls.append(headless.frame_count)
+        return str(len(calls))
+    statusbar = game.game_handler.game_components.statusbar
+    statusbar.add(TextStatusbarItem(99, function, pyxel.COLOR_WHITE))
+
+    statusbar.draw()
+    assert calls == []
+    assert statusbar.update()
+    statusbar.draw()
+    assert len(calls) == 1
+
+    # The HUD layer updates the statusbar once per frame, and only redraws it when something has changed
+    statusbar.invalidate()
+    game.hud_layer.invalidate()
+    headless.step(game.update, game.draw)
+    assert len(calls) == 2
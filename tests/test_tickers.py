@@ -0,0 +1,39 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from core.components import DEFAULT_TICKER_GROUP
+from game import events
+from game.sprites.player import PlayerHandler
+
+def run_frames(game, headless, frames: int):
+    for _ in range(frames):
+        headless.step(game.update, game.draw)
+
+def test_global_tickers_stay_flat_across_levels(game, headless, start_level):
+    start_level()
+    ticker = game.game_handler.game_components.ticker
+    event_handler = game.game_handler.game_components.event_handler
+    run_frames(game, headless, 20)
+    global_tickers = ticker.get_live_counts()[DEFAULT_TICKER_GROUP]
+
+    for event in (events.LevelRestart, events.LevelNext, events.LevelRestart, events.LevelNext, events.LevelRestart):
+        event_handler.trigger_event(event)
+        run_frames(game, headless, 20)
+        assert ticker.get_live_counts()[DEFAULT_TICKER_GROUP] == global_tickers
+
+    # Setting the player up again (as on every new level) replaces its tickers instead of adding to them
+    player_handler = next(handler for handler in game.game_handler.game_components.game_sprites.sprites_handler if isinstance(handler, PlayerHandler))
+    player_handler.setup()
+    player_handler.setup()
+    assert ticker.get_live_counts()[DEFAULT_TICKER_GROUP] == global_tickers
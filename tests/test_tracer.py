@@ -0,0 +1,57 @@
+# Copyright 2023 Cikitta Tjok <daringcuteseal@gmail.com>
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import json
+import os
+
+from core.tracer import EventTracer
+from game import events
+from game.game import Game
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "misi_hijau", "__main__.py")
+QUIT_FRAME = 60
+
+def load_main_module():
+    spec = importlib.util.spec_from_file_location("misi_hijau_main", MAIN_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_trace_is_written_when_the_game_quits(headless, tmp_path, monkeypatch):
+    trace_path = str(tmp_path / "trace.json")
+    headless.ticks = QUIT_FRAME * 10
+
+    # Play a bit, then quit the same way the outro does
+    game_update = Game.update
+    def update(game: Game):
+        game_update(game)
+        event_handler = game.game_handler.game_components.event_handler
+        if headless.frame_count == 5:
+            event_handler.trigger_event(events.StartGame)
+            event_handler.trigger_event(events.ActivateLevel)
+        elif headless.frame_count == QUIT_FRAME:
+            game._start_outro_slide()
+            game.outro_player.quit_game()
+    monkeypatch.setattr(Game, "update", update)
+
+    load_main_module().App(trace_path=trace_path)
+
+    assert headless.frame_count == QUIT_FRAME + 1
+    assert QUIT_FRAME < EventTracer.AUTOSAVE_INTERVAL # so the trace can't come from an autosave
+    with open(trace_path) as trace_file:
+        trace = json.load(trace_file)
+    assert trace["traceEvents"]
+    assert max(trace_event["args"]["frame"] for trace_event in trace["traceEvents"]) >= QUIT_FRAME # traced up to the quit